@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Shared pytest configuration for the AI Influencer test suite.
+
+Every test class sets up its own temporary directories and mocks, so the suite
+can be spread over worker processes with pytest-xdist
+(``pytest -n auto --dist loadscope``).
+"""
+
+import os
+
+# Let the GUI tests create widgets on machines without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
@@ -14,22 +14,49 @@ This module handles the generation of content for the AI Influencer system, incl
 import os
 import random
 import json
+import stat
 import logging
-from typing import Dict, List, Optional, Tuple, Union
-import openai
-from dotenv import load_dotenv
+import asyncio
+import time
+import tempfile
+from collections import OrderedDict, deque
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+from tenacity import (retry, wait_exponential, stop_after_attempt,
+                      retry_if_exception, before_sleep_log)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("content_generation.log"),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger("ContentGenerator")
 
+
+def _is_transient_openai_error(exc: BaseException) -> bool:
+    """
+    Check whether an OpenAI error is worth retrying.
+    
+    Args:
+        exc: Exception raised by the OpenAI client
+        
+    Returns:
+        bool: True for rate limits, dropped connections and timeouts
+    """
+    # openai is imported lazily; it is always loaded once a client has raised
+    import openai
+    return isinstance(exc, (openai.RateLimitError, openai.APIConnectionError,
+                            openai.APITimeoutError))
+
+# Retry transient OpenAI failures (rate limits, dropped connections, timeouts)
+# with exponential backoff; authentication and bad request errors are not retried
+_openai_retry = retry(
+    wait=wait_exponential(multiplier=1, min=1, max=60),
+    stop=stop_after_attempt(5),
+    retry=retry_if_exception(_is_transient_openai_error),
+    before_sleep=before_sleep_log(logger, logging.WARNING),
+    reraise=True
+)
+
 class ContentGenerator:
     """
     Class to handle content generation for the AI Influencer system.
@@ -37,7 +64,7 @@ class ContentGenerator:
     
     # Define topic categories and specific topics
     TOPIC_CATEGORIES = {
-        "Bitcoin": [
+        "Bitcoin": (
             "Bitcoin basics",
             "Bitcoin price analysis",
             "Bitcoin adoption",
@@ -48,8 +75,8 @@ class ContentGenerator:
             "Bitcoin economics",
             "Bitcoin vs traditional finance",
             "Bitcoin regulation"
-        ],
-        "Lightning Network": [
+        ),
+        "Lightning Network": (
             "Lightning Network basics",
             "Lightning Network nodes",
             "Lightning Network channels",
@@ -60,8 +87,8 @@ class ContentGenerator:
             "Lightning Network adoption",
             "Lightning Network vs on-chain",
             "Lightning Network development"
-        ],
-        "Nostr": [
+        ),
+        "Nostr": (
             "Nostr basics",
             "Nostr relays",
             "Nostr clients",
@@ -72,8 +99,8 @@ class ContentGenerator:
             "Nostr security",
             "Nostr integration",
             "Nostr communities"
-        ],
-        "Privacy": [
+        ),
+        "Privacy": (
             "Online privacy basics",
             "Privacy tools",
             "Privacy best practices",
@@ -84,8 +111,8 @@ class ContentGenerator:
             "Privacy for Nostr users",
             "Privacy threats",
             "Privacy future"
-        ],
-        "Node Setup": [
+        ),
+        "Node Setup": (
             "Bitcoin node setup",
             "Lightning node setup",
             "Nostr relay setup",
@@ -96,84 +123,145 @@ class ContentGenerator:
             "Node backups",
             "Node monitoring",
             "Node troubleshooting"
-        ]
+        )
     }
     
     # Define hashtags for each category
     HASHTAGS = {
-        "Bitcoin": [
+        "Bitcoin": (
             "#Bitcoin", "#BTC", "#Cryptocurrency", "#Crypto", "#DigitalGold",
             "#BitcoinHalving", "#HODL", "#Satoshi", "#Blockchain", "#BitcoinMining",
             "#CryptoTrading", "#BitcoinWallet", "#BitcoinSecurity", "#BitcoinAdoption",
             "#BitcoinEducation", "#SoundMoney", "#BitcoinDevelopment", "#BitcoinTech",
             "#Hyperbitcoinization", "#BTCPayServer", "#BitcoinNode", "#BitcoinCore",
             "#BitcoinPrice", "#BitcoinInvesting", "#BitcoinCommunity"
-        ],
-        "Lightning Network": [
+        ),
+        "Lightning Network": (
             "#LightningNetwork", "#LN", "#Bitcoin", "#BTC", "#LightningNode",
             "#LightningWallet", "#LightningPayments", "#LightningApps", "#LightningDev",
             "#LightningTip", "#LightningChannels", "#LightningLabs", "#LightningLoop",
             "#LightningPool", "#LightningTerminal", "#LightningAddress", "#LNURL",
             "#LightningPrivacy", "#LightningAdoption", "#InstantPayments", "#Micropayments",
             "#LightningInvoice", "#LightningTorch", "#NodeRunners", "#LightningHackday"
-        ],
-        "Nostr": [
+        ),
+        "Nostr": (
             "#Nostr", "#NostrRelay", "#NostrClient", "#NostrProtocol", "#NostrDev",
             "#NostrNIP", "#NostrEvents", "#NostrPubkey", "#NostrPrivkey", "#NostrZaps",
             "#NostrNotes", "#NostrDMs", "#NostrCommunity", "#NostrAdoption", "#NostrApps",
             "#DecentralizedSocial", "#NostrTools", "#NostrHackathon", "#NostrIntegration",
             "#NostrIdentity", "#NostrPrivacy", "#NostrSecurity", "#NostrUI", "#NostrUX",
             "#NostrStandards"
-        ],
-        "Privacy": [
+        ),
+        "Privacy": (
             "#Privacy", "#OnlinePrivacy", "#DigitalPrivacy", "#PrivacyMatters", "#PrivacyTools",
             "#PrivacyByDesign", "#DataPrivacy", "#PrivacyRights", "#PrivacyProtection", "#OPSEC",
             "#PrivacyAdvocate", "#PrivacyAwareness", "#PrivacyTips", "#PrivacyTech", "#Encryption",
             "#EndToEndEncryption", "#VPN", "#Tor", "#PrivacyFocus", "#PrivacyFirst",
             "#PrivacyPolicy", "#PrivacySettings", "#PrivacyControl", "#PrivacyEducation",
             "#SecureMessaging"
-        ],
-        "Node Setup": [
+        ),
+        "Node Setup": (
             "#NodeSetup", "#BitcoinNode", "#LightningNode", "#NostrRelay", "#SelfHosted",
             "#NodeRunner", "#FullNode", "#NodeMaintenance", "#NodeSecurity", "#NodeBackup",
             "#NodeMonitoring", "#RaspberryPi", "#UmbrelNode", "#StartOSNode", "#MyNodeBTC",
             "#DIYNode", "#NodeHardware", "#NodeSoftware", "#NodeConfiguration", "#NodeUpgrade",
             "#NodeTroubleshooting", "#NodePerformance", "#NodeSync", "#NodeCommunity",
             "#SelfSovereignty"
-        ]
+        )
     }
     
-    def __init__(self, api_key: Optional[str] = None):
+    __slots__ = ("api_key", "model", "_client", "_aclient", "_cache", "_cache_size",
+                 "topic_history", "custom_prompts", "_prompts_mtime", "_rng", "_concurrency")
+    
+    # Default chat model; small models are plenty for tweet-length posts
+    DEFAULT_MODEL = "gpt-4o-mini"
+    
+    # Prompts sent to the chat model
+    _SYSTEM_PROMPT = ("You are an expert in Bitcoin, Lightning Network, Nostr, and online privacy, "
+                      "creating educational content for social media.")
+    _PROMPT_TEMPLATE = ("Write a concise, informative tweet about {topic} in the context of {category}. "
+                        "The tweet should be educational, engaging, and under {budget} characters to leave room for hashtags. "
+                        "Include a thought-provoking question or call to action. Do not include hashtags in your response.")
+    
+    # Templates for content generation without the API
+    _FALLBACK_TEMPLATES = (
+        "Exploring the world of {topic} today. What's your experience with it? #Bitcoin #Crypto",
+        "Did you know? {topic} is changing how we think about digital sovereignty. Learn more!",
+        "The future of {topic} looks promising. Here's why it matters for everyone in the {category} space.",
+        "{topic} offers incredible possibilities for freedom and privacy. Are you taking advantage of it?",
+        "Just set up a new {topic} configuration. Game-changer for my {category} experience!",
+        "Thinking about {topic} and its implications for the future of {category}. Thoughts?",
+        "Today's focus: {topic}. Essential knowledge for anyone interested in {category}.",
+        "{topic} might be the most underrated aspect of {category}. Change my mind!",
+        "The evolution of {topic} shows how far we've come in the {category} ecosystem.",
+        "Security tip: Always consider {topic} when working with {category} technologies."
+    )
+    
+    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None,
+                 cache_size: int = 512, seed: Optional[Union[int, str]] = None,
+                 concurrency: Optional[int] = None):
         """
         Initialize the Content Generator.
         
         Args:
             api_key: OpenAI API key (optional)
+            model: OpenAI chat model to use (optional, defaults to DEFAULT_MODEL)
+            cache_size: Number of generated texts to keep for repeated requests (0 disables)
+            seed: Seed for topic, template and hashtag selection (optional)
+            concurrency: Maximum concurrent API requests in a batch (optional,
+                defaults to OPENAI_CONCURRENCY or 8)
         """
-        # Load .env file if it exists
-        load_dotenv()
+        # Load .env file if it exists and no API key was passed in
+        if not api_key:
+            from dotenv import load_dotenv
+            load_dotenv()
         
         # Set OpenAI API key
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
+        self.model = model or self.DEFAULT_MODEL
+        self._concurrency = concurrency or int(os.getenv('OPENAI_CONCURRENCY', '8'))
+        self._init_clients()
         if self.api_key:
-            openai.api_key = self.api_key
             logger.info("OpenAI API key set")
         else:
             logger.warning("No OpenAI API key provided")
         
+        # Cache of generated texts keyed by (model, prompt, max_length), least recently used first
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        
+        # Random generator for all selections, seedable for reproducible output
+        self._rng = random.Random(seed)
+        
         # Initialize topic history to track recently used topics
-        self.topic_history = []
+        self.topic_history = deque(maxlen=5)
         
         # Load custom prompts if available
         self.custom_prompts = {}
+        self._prompts_mtime = None
+        self._maybe_reload_prompts()
+    
+    def _maybe_reload_prompts(self) -> None:
+        """
+        Reload the custom prompts file if it changed since it was last read.
+        """
         prompts_file = os.path.join(os.path.dirname(__file__), 'custom_prompts.json')
-        if os.path.exists(prompts_file):
-            try:
-                with open(prompts_file, 'r') as f:
-                    self.custom_prompts = json.load(f)
-                logger.info("Loaded custom prompts from file")
-            except Exception as e:
-                logger.error(f"Error loading custom prompts: {str(e)}")
+        try:
+            mtime = os.stat(prompts_file).st_mtime_ns
+        except OSError:
+            return
+        
+        if mtime == self._prompts_mtime:
+            return
+        
+        try:
+            with open(prompts_file, 'rb') as f:
+                data = f.read()
+            self.custom_prompts = orjson.loads(data) if orjson else json.loads(data)
+            self._prompts_mtime = mtime
+            logger.info("Loaded custom prompts from file")
+        except Exception as e:
+            logger.error("Error loading custom prompts: %s", e)
     
     def set_api_key(self, api_key: str) -> None:
         """
@@ -183,9 +271,39 @@ class ContentGenerator:
             api_key: OpenAI API key
         """
         self.api_key = api_key
-        openai.api_key = api_key
+        self._init_clients()
         logger.info("OpenAI API key updated")
     
+    def _init_clients(self) -> None:
+        """
+        Create the OpenAI clients for the current API key.
+        
+        The clients are kept for the lifetime of the key so that their HTTP
+        connection pools (and TLS sessions) are reused across requests.
+        The async client's pool is bound to the event loop that first uses it,
+        so it serves callers running a single long-lived loop; batches create
+        their own client per run (see agenerate_batch).
+        Retries are handled by _openai_retry, so the SDK's own are disabled.
+        The SDK is imported here so that template-only use skips its import cost.
+        """
+        if self.api_key:
+            import openai
+            self._client = openai.OpenAI(api_key=self.api_key, max_retries=0, timeout=30.0)
+            self._aclient = self._new_async_client()
+        else:
+            self._client = None
+            self._aclient = None
+    
+    def _new_async_client(self):
+        """
+        Create an async OpenAI client for the current API key.
+        
+        Returns:
+            openai.AsyncOpenAI: A new client with its own connection pool
+        """
+        import openai
+        return openai.AsyncOpenAI(api_key=self.api_key, max_retries=0, timeout=30.0)
+    
     def select_topic(self, excluded_topics: Optional[List[str]] = None) -> Tuple[str, str]:
         """
         Select a topic for content generation, avoiding recently used topics.
@@ -196,73 +314,228 @@ class ContentGenerator:
         Returns:
             tuple: (category, specific_topic)
         """
-        excluded_topics = excluded_topics or []
-        excluded_topics.extend(self.topic_history[-5:] if len(self.topic_history) > 5 else self.topic_history)
-        
-        # Select a random category
-        categories = list(self.TOPIC_CATEGORIES.keys())
-        category = random.choice(categories)
-        
-        # Select a specific topic from the category, avoiding recently used topics
-        available_topics = [topic for topic in self.TOPIC_CATEGORIES[category] 
-                           if f"{category}: {topic}" not in excluded_topics]
+        # Build the exclusion set without mutating the caller's list
+        excluded = set(excluded_topics or ())
+        excluded.update(self.topic_history)
         
-        # If all topics in this category were recently used, try another category
-        if not available_topics:
-            remaining_categories = [c for c in categories if c != category]
-            if not remaining_categories:
-                # If all topics have been used recently, reset history and select any topic
-                self.topic_history = []
-                category = random.choice(categories)
-                specific_topic = random.choice(self.TOPIC_CATEGORIES[category])
-            else:
-                # Try another category
-                category = random.choice(remaining_categories)
-                specific_topic = random.choice(self.TOPIC_CATEGORIES[category])
+        # Draw topics until one hasn't been used recently; with few exclusions
+        # this almost always succeeds on the first draw
+        for _ in range(len(self._FLAT_TOPICS)):
+            category, specific_topic = self._rng.choice(self._FLAT_TOPICS)
+            if self._TOPIC_LABELS[(category, specific_topic)] not in excluded:
+                break
         else:
-            specific_topic = random.choice(available_topics)
+            # Most topics are excluded, so select from the remaining ones directly
+            available_topics = [pair for pair in self._FLAT_TOPICS
+                                if self._TOPIC_LABELS[pair] not in excluded]
+            
+            if available_topics:
+                category, specific_topic = self._rng.choice(available_topics)
+            else:
+                # If all topics have been used recently, reset history and select any topic
+                self.topic_history.clear()
+                category, specific_topic = self._rng.choice(self._FLAT_TOPICS)
         
         # Add to history
-        self.topic_history.append(f"{category}: {specific_topic}")
+        self.topic_history.append(self._TOPIC_LABELS[(category, specific_topic)])
         
-        logger.info(f"Selected topic: {category} - {specific_topic}")
+        logger.info("Selected topic: %s - %s", category, specific_topic)
         return category, specific_topic
     
-    def generate_hashtags(self, category: str, count: int = 15) -> List[str]:
+    def generate_hashtags(self, category: str, count: int = 15,
+                          seed: Optional[Union[int, str]] = None) -> List[str]:
         """
         Generate hashtags for a post based on the category.
         
         Args:
             category: The topic category
             count: Number of hashtags to generate
+            seed: Seed for a reproducible selection (optional)
             
         Returns:
             list: List of hashtags
         """
-        # Get hashtags for the specified category
-        category_hashtags = self.HASHTAGS.get(category, [])
-        
-        # If we don't have enough hashtags in this category, add some from other categories
+        # Use the category's own hashtags when it has enough, otherwise draw from
+        # the category hashtags merged with those of every other category
+        category_hashtags = self.HASHTAGS.get(category, ())
         if len(category_hashtags) < count:
-            additional_hashtags = []
-            for other_category, hashtags in self.HASHTAGS.items():
-                if other_category != category:
-                    additional_hashtags.extend(hashtags)
-            
-            # Shuffle and add additional hashtags
-            random.shuffle(additional_hashtags)
-            category_hashtags.extend(additional_hashtags)
+            category_hashtags = self._MERGED_HASHTAGS.get(category, self._ALL_HASHTAGS)
         
-        # Shuffle and select the required number of hashtags
-        random.shuffle(category_hashtags)
-        selected_hashtags = category_hashtags[:count]
+        rng = random.Random(seed) if seed is not None else self._rng
+        selected_hashtags = rng.sample(category_hashtags, min(count, len(category_hashtags)))
         
-        logger.info(f"Generated {count} hashtags for category: {category}")
+        logger.info("Generated %s hashtags for category: %s", count, category)
         return selected_hashtags
     
+    def _prompt_key(self, category: str, specific_topic: str) -> str:
+        """
+        Get the custom prompt key for a topic.
+        
+        Args:
+            category: Topic category
+            specific_topic: Specific topic
+            
+        Returns:
+            str: Prompt key, e.g. "bitcoin_bitcoin_basics"
+        """
+        prompt_key = self._PROMPT_KEYS.get((category, specific_topic))
+        if prompt_key is None:
+            # Topics outside TOPIC_CATEGORIES are keyed on the fly
+            prompt_key = f"{category}_{specific_topic}".replace(" ", "_").lower()
+        return prompt_key
+    
+    def _build_request(self, category: str, specific_topic: str, max_length: int,
+                       model: Optional[str] = None) -> Dict:
+        """
+        Build the chat completion request for a topic.
+        
+        Args:
+            category: Topic category
+            specific_topic: Specific topic
+            max_length: Maximum length of the post content
+            model: OpenAI chat model to use (optional, defaults to self.model)
+            
+        Returns:
+            dict: Keyword arguments for the chat completion call
+        """
+        # Get custom prompt if available, otherwise use default
+        self._maybe_reload_prompts()
+        prompt_key = self._prompt_key(category, specific_topic)
+        custom_prompt = self.custom_prompts.get(prompt_key)
+        
+        if custom_prompt:
+            prompt = custom_prompt
+        else:
+            prompt = self._PROMPT_TEMPLATE.format(topic=specific_topic, category=category,
+                                                  budget=max_length - 30)
+        
+        return {
+            "model": model or self.model,
+            "messages": [
+                {"role": "system", "content": self._SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            "max_tokens": 80,
+            "temperature": 0.7
+        }
+    
+    @_openai_retry
+    def _call_openai(self, request: Dict):
+        """
+        Send a chat completion request, retrying transient failures.
+        
+        Args:
+            request: Keyword arguments for chat.completions.create
+            
+        Returns:
+            The chat completion response
+        """
+        return self._client.chat.completions.create(**request)
+    
+    @_openai_retry
+    async def _acall_openai(self, request: Dict, client=None):
+        """
+        Send a chat completion request with the async client, retrying transient failures.
+        
+        Args:
+            request: Keyword arguments for chat.completions.create
+            client: Async OpenAI client to use (optional, defaults to self._aclient)
+            
+        Returns:
+            The chat completion response
+        """
+        return await (client or self._aclient).chat.completions.create(**request)
+    
+    def _cache_get(self, key: Tuple) -> Optional[str]:
+        """
+        Look up previously generated text.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            str: Cached text, or None if not cached
+        """
+        text = self._cache.get(key)
+        if text is not None:
+            self._cache.move_to_end(key)
+        return text
+    
+    def _cache_put(self, key: Tuple, text: str) -> None:
+        """
+        Store generated text, evicting the least recently used entries.
+        
+        Args:
+            key: Cache key
+            text: Generated text
+        """
+        if self._cache_size <= 0:
+            return
+        
+        self._cache[key] = text
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+    
+    def _build_result(self, text: str, category: str, specific_topic: str, max_length: int,
+                      seed: Optional[Union[int, str]] = None) -> Dict:
+        """
+        Build the content result from generated text.
+        
+        Args:
+            text: Generated text
+            category: Topic category
+            specific_topic: Specific topic
+            max_length: Maximum length of the post content
+            seed: Seed for a reproducible hashtag selection (optional)
+            
+        Returns:
+            dict: Generated content including text, hashtags, and topic info
+        """
+        text = text.strip()
+        
+        # Ensure text is within length limit
+        if len(text) > max_length - 30:  # Leave room for hashtags
+            text = text[:max_length - 33] + "..."
+        
+        # Generate hashtags
+        hashtags = self.generate_hashtags(category, seed=seed)
+        
+        logger.info("Generated content for topic: %s - %s", category, specific_topic)
+        
+        return {
+            "success": True,
+            "text": text,
+            "hashtags": hashtags,
+            "category": category,
+            "topic": specific_topic,
+            "full_text_with_hashtags": f"{text}\n\n{' '.join(hashtags)}"
+        }
+    
+    def _build_error(self, error: str, category: str, specific_topic: str) -> Dict:
+        """
+        Build the content result for a failed generation.
+        
+        Args:
+            error: Error message
+            category: Topic category
+            specific_topic: Specific topic
+            
+        Returns:
+            dict: Error result including topic info
+        """
+        return {
+            "success": False,
+            "error": error,
+            "category": category,
+            "topic": specific_topic
+        }
+    
     def generate_content(self, category: Optional[str] = None, 
                         specific_topic: Optional[str] = None,
-                        max_length: int = 280) -> Dict:
+                        max_length: int = 280,
+                        model: Optional[str] = None,
+                        seed: Optional[Union[int, str]] = None) -> Dict:
         """
         Generate content for a post.
         
@@ -270,6 +543,8 @@ class ContentGenerator:
             category: Topic category (optional)
             specific_topic: Specific topic (optional)
             max_length: Maximum length of the post content
+            model: OpenAI chat model to use (optional, defaults to self.model)
+            seed: Seed for reproducible hashtags, e.g. when regenerating a post (optional)
             
         Returns:
             dict: Generated content including text, hashtags, and topic info
@@ -281,65 +556,305 @@ class ContentGenerator:
         # Check if API key is set
         if not self.api_key:
             logger.error("Cannot generate content: No OpenAI API key provided")
-            return {
-                "success": False,
-                "error": "No OpenAI API key provided",
-                "category": category,
-                "topic": specific_topic
-            }
+            return self._build_error("No OpenAI API key provided", category, specific_topic)
         
         try:
-            # Get custom prompt if available, otherwise use default
-            prompt_key = f"{category}_{specific_topic}".replace(" ", "_").lower()
-            custom_prompt = self.custom_prompts.get(prompt_key)
+            request = self._build_request(category, specific_topic, max_length, model)
+            cache_key = (request["model"], request["messages"][-1]["content"], max_length)
+            text = self._cache_get(cache_key)
             
-            if custom_prompt:
-                prompt = custom_prompt
-            else:
-                prompt = f"Write a concise, informative tweet about {specific_topic} in the context of {category}. "
-                prompt += f"The tweet should be educational, engaging, and under {max_length - 30} characters to leave room for hashtags. "
-                prompt += "Include a thought-provoking question or call to action. Do not include hashtags in your response."
-            
-            # Generate content using OpenAI API
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert in Bitcoin, Lightning Network, Nostr, and online privacy, creating educational content for social media."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=150,
-                temperature=0.7
+            if text is None:
+                # Generate content using OpenAI API
+                response = self._call_openai(request)
+                
+                # Extract the generated text
+                text = response.choices[0].message.content
+                self._cache_put(cache_key, text)
+            
+            return self._build_result(text, category, specific_topic, max_length, seed)
+        
+        except Exception as e:
+            logger.error("Error generating content: %s", e)
+            return self._build_error(str(e), category, specific_topic)
+    
+    async def _agenerate_one(self, category: str, specific_topic: str,
+                             max_length: int = 280,
+                             model: Optional[str] = None,
+                             client=None) -> Dict:
+        """
+        Generate content for a single topic using the async OpenAI client.
+        
+        Args:
+            category: Topic category
+            specific_topic: Specific topic
+            max_length: Maximum length of the post content
+            model: OpenAI chat model to use (optional, defaults to self.model)
+            client: Async OpenAI client to use (optional, defaults to self._aclient)
+            
+        Returns:
+            dict: Generated content including text, hashtags, and topic info
+        """
+        client = client or self._aclient
+        if not client:
+            logger.error("Cannot generate content: No OpenAI API key provided")
+            return self._build_error("No OpenAI API key provided", category, specific_topic)
+        
+        try:
+            request = self._build_request(category, specific_topic, max_length, model)
+            cache_key = (request["model"], request["messages"][-1]["content"], max_length)
+            text = self._cache_get(cache_key)
+            
+            if text is None:
+                response = await self._acall_openai(request, client)
+                text = response.choices[0].message.content
+                self._cache_put(cache_key, text)
+            
+            return self._build_result(text, category, specific_topic, max_length)
+        
+        except Exception as e:
+            logger.error("Error generating content: %s", e)
+            return self._build_error(str(e), category, specific_topic)
+    
+    async def agenerate_content(self, category: Optional[str] = None,
+                                specific_topic: Optional[str] = None,
+                                max_length: int = 280,
+                                model: Optional[str] = None) -> Dict:
+        """
+        Generate content for a post asynchronously.
+        
+        Args:
+            category: Topic category (optional)
+            specific_topic: Specific topic (optional)
+            max_length: Maximum length of the post content
+            model: OpenAI chat model to use (optional, defaults to self.model)
+            
+        Returns:
+            dict: Generated content including text, hashtags, and topic info
+        """
+        # Select a topic if not provided
+        if not category or not specific_topic:
+            category, specific_topic = self.select_topic()
+        
+        return await self._agenerate_one(category, specific_topic, max_length, model)
+    
+    async def astream_content(self, category: Optional[str] = None,
+                              specific_topic: Optional[str] = None,
+                              max_length: int = 280,
+                              model: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Stream content for a post as it is generated.
+        
+        Text is yielded as soon as the model produces it. Once the text is
+        complete, the hashtags are yielded as a final chunk, so the joined
+        chunks match full_text_with_hashtags (before any length truncation).
+        
+        Args:
+            category: Topic category (optional)
+            specific_topic: Specific topic (optional)
+            max_length: Maximum length of the post content
+            model: OpenAI chat model to use (optional, defaults to self.model)
+            
+        Yields:
+            str: Pieces of the post text, followed by the hashtag block
+        """
+        # Select a topic if not provided
+        if not category or not specific_topic:
+            category, specific_topic = self.select_topic()
+        
+        if not self._aclient:
+            logger.error("Cannot stream content: No OpenAI API key provided")
+            raise ValueError("No OpenAI API key provided")
+        
+        try:
+            request = self._build_request(category, specific_topic, max_length, model)
+            stream = await self._acall_openai({**request, "stream": True})
+            
+            parts = []
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
+            
+            cache_key = (request["model"], request["messages"][-1]["content"], max_length)
+            self._cache_put(cache_key, "".join(parts))
+        
+        except Exception as e:
+            logger.error("Error streaming content: %s", e)
+            raise
+        
+        hashtags = self.generate_hashtags(category)
+        logger.info("Streamed content for topic: %s - %s", category, specific_topic)
+        yield f"\n\n{' '.join(hashtags)}"
+    
+    async def agenerate_batch(self, topics: List[Tuple[str, str]],
+                              max_length: int = 280) -> List[Dict]:
+        """
+        Generate content for several topics concurrently.
+        
+        At most `concurrency` requests are in flight at once, so large batches
+        stay within the OpenAI rate limits instead of triggering retries.
+        
+        Args:
+            topics: List of (category, specific_topic) tuples
+            max_length: Maximum length of each post content
+            
+        Returns:
+            list: Generated content for each topic, in the same order
+        """
+        # The semaphore and the client's connection pool are both bound to the
+        # running event loop, so both are created per batch and the client is
+        # closed before the loop can go away
+        client = self._new_async_client() if self.api_key else None
+        semaphore = asyncio.Semaphore(self._concurrency)
+        
+        async def generate_one(category: str, specific_topic: str) -> Dict:
+            async with semaphore:
+                return await self._agenerate_one(category, specific_topic, max_length, client=client)
+        
+        try:
+            return await asyncio.gather(
+                *[generate_one(category, specific_topic) for category, specific_topic in topics]
             )
+        finally:
+            if client is not None:
+                await client.close()
+    
+    def generate_batch(self, topics: List[Tuple[str, str]],
+                       max_length: int = 280) -> List[Dict]:
+        """
+        Generate content for several topics concurrently (blocking wrapper).
+        
+        Args:
+            topics: List of (category, specific_topic) tuples
+            max_length: Maximum length of each post content
             
-            # Extract the generated text
-            text = response.choices[0].message.content.strip()
+        Returns:
+            list: Generated content for each topic, in the same order
+        """
+        return asyncio.run(self.agenerate_batch(topics, max_length))
+    
+    def generate_content_batch_offline(self, topics: List[Tuple[str, str]],
+                                       max_length: int = 280,
+                                       poll_interval: int = 60,
+                                       state_file: Optional[str] = None) -> List[Dict]:
+        """
+        Generate content for many topics through the OpenAI Batch API.
+        
+        The Batch API trades latency for lower cost and higher throughput, so this
+        is meant for pre-generating scheduled posts rather than interactive use.
+        The submitted batch is recorded in a state file so that an interrupted
+        run resumes polling the same batch instead of submitting a new one.
+        
+        Args:
+            topics: List of (category, specific_topic) tuples
+            max_length: Maximum length of each post content
+            poll_interval: Seconds to wait between batch status checks
+            state_file: Path of the batch state file (optional)
             
-            # Ensure text is within length limit
-            if len(text) > max_length - 30:  # Leave room for hashtags
-                text = text[:max_length - 33] + "..."
+        Returns:
+            list: Generated content for each topic, in the same order
+        """
+        state_file = state_file or os.path.join(os.path.dirname(__file__), 'batch_state.json')
+        
+        # Check if API key is set
+        if not self.api_key:
+            logger.error("Cannot generate content batch: No OpenAI API key provided")
+            return [self._build_error("No OpenAI API key provided", c, t) for c, t in topics]
+        
+        client = self._client
+        
+        try:
+            # Resume a previously submitted batch if one is pending
+            state = None
+            if os.path.exists(state_file):
+                with open(state_file, 'r') as f:
+                    state = json.load(f)
+                logger.info("Resuming content batch: %s", state['batch_id'])
+            else:
+                state = self._submit_content_batch(client, topics, max_length)
+                with open(state_file, 'w') as f:
+                    json.dump(state, f, indent=2)
             
-            # Generate hashtags
-            hashtags = self.generate_hashtags(category)
+            # Wait for the batch to finish
+            batch = client.batches.retrieve(state["batch_id"])
+            while batch.status not in ("completed", "failed", "expired", "cancelled"):
+                time.sleep(poll_interval)
+                batch = client.batches.retrieve(state["batch_id"])
             
-            logger.info(f"Generated content for topic: {category} - {specific_topic}")
+            # Collect the generated text by custom_id
+            texts = {}
+            if batch.status == "completed" and batch.output_file_id:
+                output = client.files.content(batch.output_file_id).text
+                for line in output.splitlines():
+                    if not line.strip():
+                        continue
+                    item = json.loads(line)
+                    response = item.get("response") or {}
+                    if response.get("status_code") == 200:
+                        texts[item["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
             
-            return {
-                "success": True,
-                "text": text,
-                "hashtags": hashtags,
-                "category": category,
-                "topic": specific_topic,
-                "full_text_with_hashtags": f"{text}\n\n{' '.join(hashtags[:15])}"
-            }
+            # Re-associate the output with the submitted topics
+            results = []
+            for custom_id, (category, specific_topic) in state["requests"]:
+                if custom_id in texts:
+                    results.append(self._build_result(texts[custom_id], category,
+                                                      specific_topic, state["max_length"]))
+                else:
+                    results.append(self._build_error(f"Batch request not completed ({batch.status})",
+                                                     category, specific_topic))
             
+            os.remove(state_file)
+            logger.info("Content batch %s finished with status: %s", state['batch_id'], batch.status)
+            return results
+        
         except Exception as e:
-            logger.error(f"Error generating content: {str(e)}")
-            return {
-                "success": False,
-                "error": str(e),
-                "category": category,
-                "topic": specific_topic
-            }
+            logger.error("Error generating content batch: %s", e)
+            return [self._build_error(str(e), c, t) for c, t in topics]
+    
+    def _submit_content_batch(self, client, topics: List[Tuple[str, str]],
+                              max_length: int) -> Dict:
+        """
+        Upload a JSONL request file and create a batch for it.
+        
+        Args:
+            client: OpenAI client
+            topics: List of (category, specific_topic) tuples
+            max_length: Maximum length of each post content
+            
+        Returns:
+            dict: Batch state with the batch ID and the custom_id to topic mapping
+        """
+        requests = []
+        with tempfile.NamedTemporaryFile('w', suffix=".jsonl", delete=False) as tmp:
+            for i, (category, specific_topic) in enumerate(topics):
+                prompt_key = self._prompt_key(category, specific_topic)
+                custom_id = f"{i}_{prompt_key}"
+                tmp.write(json.dumps({
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self._build_request(category, specific_topic, max_length)
+                }) + "\n")
+                requests.append([custom_id, [category, specific_topic]])
+            input_path = tmp.name
+        
+        try:
+            with open(input_path, 'rb') as f:
+                input_file = client.files.create(file=f, purpose="batch")
+        finally:
+            os.unlink(input_path)
+        
+        batch = client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        
+        logger.info("Submitted content batch %s with %s requests", batch.id, len(requests))
+        return {"batch_id": batch.id, "max_length": max_length, "requests": requests}
     
     def generate_content_without_api(self, category: Optional[str] = None, 
                                    specific_topic: Optional[str] = None) -> Dict:
@@ -357,28 +872,14 @@ class ContentGenerator:
         if not category or not specific_topic:
             category, specific_topic = self.select_topic()
         
-        # Template-based content generation
-        templates = [
-            "Exploring the world of {topic} today. What's your experience with it? #Bitcoin #Crypto",
-            "Did you know? {topic} is changing how we think about digital sovereignty. Learn more!",
-            "The future of {topic} looks promising. Here's why it matters for everyone in the {category} space.",
-            "{topic} offers incredible possibilities for freedom and privacy. Are you taking advantage of it?",
-            "Just set up a new {topic} configuration. Game-changer for my {category} experience!",
-            "Thinking about {topic} and its implications for the future of {category}. Thoughts?",
-            "Today's focus: {topic}. Essential knowledge for anyone interested in {category}.",
-            "{topic} might be the most underrated aspect of {category}. Change my mind!",
-            "The evolution of {topic} shows how far we've come in the {category} ecosystem.",
-            "Security tip: Always consider {topic} when working with {category} technologies."
-        ]
-        
         # Select a random template and fill it
-        template = random.choice(templates)
+        template = self._rng.choice(self._FALLBACK_TEMPLATES)
         text = template.format(topic=specific_topic, category=category)
         
         # Generate hashtags
         hashtags = self.generate_hashtags(category)
         
-        logger.info(f"Generated template-based content for topic: {category} - {specific_topic}")
+        logger.info("Generated template-based content for topic: %s - %s", category, specific_topic)
         
         return {
             "success": True,
@@ -386,9 +887,44 @@ class ContentGenerator:
             "hashtags": hashtags,
             "category": category,
             "topic": specific_topic,
-            "full_text_with_hashtags": f"{text}\n\n{' '.join(hashtags[:15])}"
+            "full_text_with_hashtags": f"{text}\n\n{' '.join(hashtags)}"
         }
     
+    def generate_batch_without_api(self, n: int) -> List[Dict]:
+        """
+        Generate several posts without using the OpenAI API (fallback method).
+        
+        Topics and templates for the whole batch are drawn up front, and the
+        topic history is left untouched.
+        
+        Args:
+            n: Number of posts to generate
+            
+        Returns:
+            list: Generated content dicts, one per post
+        """
+        pairs = self._rng.choices(self._FLAT_TOPICS, k=n)
+        templates = self._rng.choices(self._FALLBACK_TEMPLATES, k=n)
+        
+        results = []
+        for (category, specific_topic), template in zip(pairs, templates):
+            text = template.format(topic=specific_topic, category=category)
+            pool = self.HASHTAGS[category]
+            if len(pool) < 15:
+                pool = self._MERGED_HASHTAGS[category]
+            hashtags = self._rng.sample(pool, min(15, len(pool)))
+            results.append({
+                "success": True,
+                "text": text,
+                "hashtags": hashtags,
+                "category": category,
+                "topic": specific_topic,
+                "full_text_with_hashtags": f"{text}\n\n{' '.join(hashtags)}"
+            })
+        
+        logger.info("Generated %s template-based posts", n)
+        return results
+    
     def save_custom_prompt(self, category: str, specific_topic: str, prompt: str) -> bool:
         """
         Save a custom prompt for a specific topic.
@@ -401,26 +937,92 @@ class ContentGenerator:
         Returns:
             bool: True if successful, False otherwise
         """
+        tmp_path = None
         try:
-            prompt_key = f"{category}_{specific_topic}".replace(" ", "_").lower()
+            # Pick up prompts saved by other processes before rewriting the file
+            self._maybe_reload_prompts()
+            
+            prompt_key = self._prompt_key(category, specific_topic)
             self.custom_prompts[prompt_key] = prompt
             
-            # Save to file
+            if orjson:
+                data = orjson.dumps(self.custom_prompts, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(self.custom_prompts, indent=2).encode('utf-8')
+            
+            # Save to a temporary file and swap it in so readers never see a partial file
             prompts_file = os.path.join(os.path.dirname(__file__), 'custom_prompts.json')
-            with open(prompts_file, 'w') as f:
-                json.dump(self.custom_prompts, f, indent=2)
             
-            logger.info(f"Saved custom prompt for {category} - {specific_topic}")
+            # Create the temporary file like open() would, so the umask
+            # applies to a newly created prompts file
+            candidate = f"{prompts_file}.{os.urandom(4).hex()}.tmp"
+            fd = os.open(candidate, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+            tmp_path = candidate
+            with os.fdopen(fd, 'wb') as tmp:
+                tmp.write(data)
+            
+            # Keep the permissions of a prompts file being replaced
+            try:
+                os.chmod(tmp_path, stat.S_IMODE(os.stat(prompts_file).st_mode))
+            except FileNotFoundError:
+                pass
+            
+            os.replace(tmp_path, prompts_file)
+            tmp_path = None
+            self._prompts_mtime = os.stat(prompts_file).st_mtime_ns
+            
+            logger.info("Saved custom prompt for %s - %s", category, specific_topic)
             return True
             
         except Exception as e:
-            logger.error(f"Error saving custom prompt: {str(e)}")
+            logger.error("Error saving custom prompt: %s", e)
+            # Do not leave a partial temporary file behind
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
             return False
 
 
+# Precompute the flat (category, topic) list, the labels stored in topic history
+# and the custom prompt keys
+ContentGenerator._FLAT_TOPICS = tuple(
+    (category, topic)
+    for category, topics in ContentGenerator.TOPIC_CATEGORIES.items() for topic in topics
+)
+ContentGenerator._TOPIC_LABELS = {
+    (category, topic): f"{category}: {topic}" for category, topic in ContentGenerator._FLAT_TOPICS
+}
+ContentGenerator._PROMPT_KEYS = {
+    (category, topic): f"{category}_{topic}".replace(" ", "_").lower()
+    for category, topic in ContentGenerator._FLAT_TOPICS
+}
+
+# Precompute the hashtag pools used when a category has too few hashtags of its own
+ContentGenerator._ALL_HASHTAGS = tuple(
+    tag for tags in ContentGenerator.HASHTAGS.values() for tag in tags
+)
+ContentGenerator._MERGED_HASHTAGS = {
+    category: tags + tuple(tag for other_category, other_tags in ContentGenerator.HASHTAGS.items()
+                           if other_category != category for tag in other_tags)
+    for category, tags in ContentGenerator.HASHTAGS.items()
+}
+
+
 # Example usage
 if __name__ == "__main__":
     # This code will only run if the file is executed directly
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler("content_generation.log"),
+            logging.StreamHandler()
+        ]
+    )
+    
     generator = ContentGenerator()
     
     # Example: Set API key manually
@@ -13,24 +13,47 @@ This module provides a PyQt5-based GUI for the AI Influencer system, including:
 
 import os
 import sys
+import csv
 import json
+import random
+import time
 import logging
 import datetime
-from typing import Dict, List, Optional, Tuple, Union
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QTabWidget, 
                            QVBoxLayout, QHBoxLayout, QFormLayout, QGridLayout,
                            QLabel, QLineEdit, QPushButton, QTextEdit, QComboBox,
-                           QCheckBox, QSpinBox, QTableWidget, QTableWidgetItem,
-                           QHeaderView, QFileDialog, QMessageBox, QProgressBar,
-                           QGroupBox, QScrollArea, QFrame, QSplitter, QStatusBar)
-from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal, QSize
-from PyQt5.QtGui import QIcon, QPixmap, QFont, QColor
+                           QCheckBox, QSpinBox, QTableView, QStyledItemDelegate,
+                           QStyle, QStyleOptionButton, QHeaderView, QFileDialog,
+                           QMessageBox, QProgressBar, QProgressDialog, QGroupBox, QScrollArea,
+                           QFrame, QSplitter, QStatusBar)
+from PyQt5.QtCore import (Qt, QObject, QAbstractTableModel, QModelIndex, QEvent, QSettings,
+                          QTimer, QThread, QThreadPool, pyqtSignal, QSize)
+from PyQt5.QtGui import QIcon, QPixmap, QPixmapCache, QFont, QColor
 from dotenv import load_dotenv
 
-# Import other modules
-from twitter_api import TwitterAPI
-from content_generator import ContentGenerator
-from image_generator import ImageGenerator
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import keyring
+except ImportError:
+    keyring = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Other modules are imported on first use (see _ensure_backends) so the window
+# shows without waiting for tweepy, openai, Pillow and matplotlib to load
+if TYPE_CHECKING:
+    from twitter_api import TwitterAPI
+    from content_generator import ContentGenerator
+    from image_generator import ImageGenerator
 
 # Configure logging
 logging.basicConfig(
@@ -43,16 +66,76 @@ logging.basicConfig(
 )
 logger = logging.getLogger("GUI")
 
+# Service name and entries used for API secrets in the OS keyring
+KEYRING_SERVICE = "ai_influencer"
+CREDENTIAL_NAMES = ('twitter_api_key', 'twitter_api_secret', 'twitter_access_token',
+                    'twitter_access_token_secret', 'openai_api_key')
+
+
+def _json_dumps(obj, indent: bool = False) -> bytes:
+    """
+    Serialize an object to JSON bytes, using orjson when it is installed.
+    
+    Args:
+        obj: Object to serialize
+        indent: Whether to indent the output by two spaces
+        
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
+
+
+def _json_loads(data: bytes):
+    """
+    Parse JSON bytes, using orjson when it is installed.
+    
+    Args:
+        data: UTF-8 encoded JSON
+        
+    Returns:
+        The parsed object
+    """
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _atomic_write(path: str, data: bytes):
+    """
+    Write a file in one buffered write, replacing it atomically.
+    
+    The data goes to a temporary file that is synced and then renamed over
+    the target, so a crash never leaves a partially written file behind.
+    
+    Args:
+        path: Path of the file to write
+        data: File contents
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
 class PostingWorker(QThread):
-    """Worker thread for handling posting operations."""
+    """
+    Worker thread for handling posting operations.
+    
+    Posting goes through blocking clients (tweepy, Pillow, the OpenAI SDK),
+    so it runs off the GUI thread; one post per schedule interval keeps the
+    cost of starting the thread negligible.
+    """
     
     # Define signals
     status_update = pyqtSignal(str)
     post_complete = pyqtSignal(dict)
     post_error = pyqtSignal(str)
     
-    def __init__(self, twitter_api: TwitterAPI, content_generator: ContentGenerator, 
-                image_generator: ImageGenerator):
+    def __init__(self, twitter_api: "TwitterAPI", content_generator: "ContentGenerator", 
+                image_generator: "ImageGenerator"):
         """
         Initialize the posting worker.
         
@@ -72,6 +155,10 @@ class PostingWorker(QThread):
         self.running = True
         
         try:
+            # Warm up the image generator while the content is being generated
+            warmup = threading.Thread(target=self.image_generator.warmup, daemon=True)
+            warmup.start()
+            
             # Generate content
             self.status_update.emit("Generating content...")
             content = self.content_generator.generate_content()
@@ -83,6 +170,7 @@ class PostingWorker(QThread):
             
             # Generate image
             self.status_update.emit("Generating image...")
+            warmup.join()
             image_path = self.image_generator.generate_image(
                 content["text"], 
                 content["category"]
@@ -130,53 +218,52 @@ class PostingWorker(QThread):
         self.wait()
 
 
-class ScheduleWorker(QThread):
-    """Worker thread for handling scheduled posting."""
+class ScheduleWorker(QObject):
+    """Timer-driven scheduler for automatic posting."""
     
     # Define signals
     schedule_update = pyqtSignal(str)
     trigger_post = pyqtSignal()
     
-    def __init__(self, interval_hours: int = 24):
+    _COUNTDOWN_FORMAT = "Next post in: %02d:%02d:%02d".__mod__
+    
+    def __init__(self, interval_hours: int = 24, parent: Optional[QObject] = None):
         """
         Initialize the schedule worker.
         
+        The post itself is triggered by a single-shot timer, so the process
+        only wakes once per second to refresh the countdown display.
+        
         Args:
             interval_hours: Hours between posts
+            parent: Parent object (optional)
         """
-        super().__init__()
+        super().__init__(parent)
         self.interval_hours = interval_hours
         self.running = False
-        self.next_post_time = None
+        self.next_post_monotonic = None
+        self._last_remaining = -1
+        
+        # Timer refreshing the countdown display
+        self._tick_timer = QTimer(self)
+        self._tick_timer.timeout.connect(self._update_countdown)
+        
+        # Timer firing when the next post is due
+        self._post_timer = QTimer(self)
+        self._post_timer.setSingleShot(True)
+        self._post_timer.timeout.connect(self._post_due)
     
-    def run(self):
-        """Run the scheduling process."""
+    def start(self):
+        """Start the scheduling process."""
         self.running = True
-        self.next_post_time = datetime.datetime.now() + datetime.timedelta(hours=self.interval_hours)
-        
-        while self.running:
-            # Calculate time until next post
-            now = datetime.datetime.now()
-            time_diff = self.next_post_time - now
-            
-            # Update status
-            hours, remainder = divmod(time_diff.total_seconds(), 3600)
-            minutes, seconds = divmod(remainder, 60)
-            time_str = f"{int(hours):02d}:{int(minutes):02d}:{int(seconds):02d}"
-            self.schedule_update.emit(f"Next post in: {time_str}")
-            
-            # Check if it's time to post
-            if now >= self.next_post_time:
-                self.trigger_post.emit()
-                self.next_post_time = now + datetime.timedelta(hours=self.interval_hours)
-            
-            # Sleep for a short time
-            self.msleep(1000)  # 1 second
+        self._schedule_next_post()
+        self._tick_timer.start(1000)  # 1 second
     
     def stop(self):
         """Stop the worker."""
         self.running = False
-        self.wait()
+        self._tick_timer.stop()
+        self._post_timer.stop()
     
     def set_interval(self, hours: int):
         """
@@ -186,7 +273,246 @@ class ScheduleWorker(QThread):
             hours: Hours between posts
         """
         self.interval_hours = hours
-        self.next_post_time = datetime.datetime.now() + datetime.timedelta(hours=self.interval_hours)
+        if self.running:
+            self._schedule_next_post()
+        else:
+            self.next_post_monotonic = time.monotonic() + self.interval_hours * 3600
+    
+    def _schedule_next_post(self):
+        """Schedule the next post one interval from now."""
+        self.next_post_monotonic = time.monotonic() + self.interval_hours * 3600
+        self._post_timer.start(int(self.interval_hours * 3600 * 1000))
+        self._last_remaining = -1
+        self._update_countdown()
+    
+    def _update_countdown(self):
+        """Emit the time remaining until the next post."""
+        remaining = max(int(self.next_post_monotonic - time.monotonic()), 0)
+        
+        # Skip the update if the displayed second has not changed
+        if remaining == self._last_remaining:
+            return
+        self._last_remaining = remaining
+        
+        hours, remainder = divmod(remaining, 3600)
+        minutes, seconds = divmod(remainder, 60)
+        self.schedule_update.emit(self._COUNTDOWN_FORMAT((hours, minutes, seconds)))
+    
+    def _post_due(self):
+        """Trigger a post and schedule the next one."""
+        self.trigger_post.emit()
+        self._schedule_next_post()
+
+
+class ExportWorker(QObject):
+    """Worker writing the post history to a CSV file off the GUI thread."""
+    
+    # Define signals
+    finished = pyqtSignal(str)
+    error = pyqtSignal(str)
+    
+    def __init__(self, history: List[Dict], file_path: str):
+        """
+        Initialize the export worker.
+        
+        Args:
+            history: List of post history items to export
+            file_path: Path of the CSV file to write
+        """
+        super().__init__()
+        self.history = history
+        self.file_path = file_path
+    
+    def run(self):
+        """Write the CSV file."""
+        try:
+            with open(self.file_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+                writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+                writer.writerow(["Date", "Category", "Topic", "Content", "Hashtags", "Tweet ID"])
+                writer.writerows(
+                    (
+                        post.get('timestamp', ''),
+                        post.get('category', ''),
+                        post.get('topic', ''),
+                        post.get('text', ''),
+                        ' '.join(post.get('hashtags', [])),
+                        post.get('tweet_id', '')
+                    )
+                    for post in self.history
+                )
+            
+            self.finished.emit(self.file_path)
+        
+        except Exception as e:
+            logger.error(f"Error exporting history: {str(e)}")
+            self.error.emit(str(e))
+
+
+class HistoryTableModel(QAbstractTableModel):
+    """
+    Table model presenting the post history, newest post first.
+    
+    Only the newest FETCH_SIZE posts are exposed at first; the view fetches
+    further batches as it is scrolled to the end.
+    """
+    
+    HEADERS = ("Date", "Category", "Topic", "Content", "Actions")
+    FETCH_SIZE = 500
+    
+    def __init__(self, parent: Optional[QObject] = None):
+        """
+        Initialize the history model.
+        
+        Args:
+            parent: Parent object (optional)
+        """
+        super().__init__(parent)
+        self._history = []
+        self._dates = {}
+        self._row_count = 0
+    
+    def set_history(self, history: List[Dict]):
+        """
+        Replace the displayed history.
+        
+        The list is referenced, not copied; add posts with append_post.
+        
+        Args:
+            history: List of post history items, oldest first
+        """
+        self.beginResetModel()
+        self._history = history
+        self._dates = {}
+        self._row_count = min(len(history), self.FETCH_SIZE)
+        self.endResetModel()
+    
+    def append_post(self, post: Dict):
+        """
+        Append a post to the history, inserting a single row at the top.
+        
+        Args:
+            post: Post data
+        """
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self._history.append(post)
+        self._row_count += 1
+        self.endInsertRows()
+    
+    def post(self, row: int) -> Dict:
+        """
+        Get the post shown in a row.
+        
+        Args:
+            row: Table row
+            
+        Returns:
+            dict: Post data
+        """
+        return self._history[len(self._history) - 1 - row]
+    
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Return the number of posts fetched so far."""
+        return 0 if parent.isValid() else self._row_count
+    
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        """Return whether older posts remain to be shown."""
+        return not parent.isValid() and self._row_count < len(self._history)
+    
+    def fetchMore(self, parent: QModelIndex = QModelIndex()):
+        """Show the next batch of older posts."""
+        if parent.isValid():
+            return
+        
+        count = min(len(self._history) - self._row_count, self.FETCH_SIZE)
+        if count <= 0:
+            return
+        
+        self.beginInsertRows(QModelIndex(), self._row_count, self._row_count + count - 1)
+        self._row_count += count
+        self.endInsertRows()
+    
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Return the number of columns."""
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):
+        """Return the column titles."""
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+    
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        """Return the text of a cell."""
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        
+        position = len(self._history) - 1 - index.row()
+        column = index.column()
+        post = self._history[position]
+        
+        if column == 0:
+            return self._date(position, post)
+        if column == 1:
+            return post.get('category', '')
+        if column == 2:
+            return post.get('topic', '')
+        if column == 3:
+            return post.get('text', '')
+        return "View"
+    
+    def _date(self, position: int, post: Dict) -> str:
+        """
+        Format the date of a post, caching the result per post.
+        
+        Args:
+            position: Position of the post in the history
+            post: Post data
+            
+        Returns:
+            str: Formatted date
+        """
+        date = self._dates.get(position)
+        if date is None:
+            date = post.get('timestamp', '')
+            
+            # isoformat() output only needs slicing; parse anything else
+            if len(date) >= 16 and date[10] == 'T':
+                date = f"{date[:10]} {date[11:16]}"
+            elif date:
+                try:
+                    date = datetime.datetime.fromisoformat(date).strftime("%Y-%m-%d %H:%M")
+                except ValueError:
+                    pass
+            
+            self._dates[position] = date
+        return date
+
+
+class ViewButtonDelegate(QStyledItemDelegate):
+    """Delegate drawing a "View" button in a cell without creating a widget."""
+    
+    # Define signals
+    view_requested = pyqtSignal(int)
+    
+    def paint(self, painter, option, index):
+        """Draw the cell as a push button."""
+        button = QStyleOptionButton()
+        button.rect = option.rect.adjusted(2, 2, -2, -2)
+        button.text = index.data()
+        button.state = QStyle.State_Enabled
+        
+        widget = option.widget
+        style = widget.style() if widget else QApplication.style()
+        style.drawControl(QStyle.CE_PushButton, button, painter, widget)
+    
+    def editorEvent(self, event, model, option, index):
+        """Request the post of the row when the button is clicked."""
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            self.view_requested.emit(index.row())
+            return True
+        if event.type() == QEvent.MouseButtonDblClick:
+            return True  # The release already opened the post
+        return super().editorEvent(event, model, option, index)
 
 
 class AIInfluencerGUI(QMainWindow):
@@ -199,33 +525,59 @@ class AIInfluencerGUI(QMainWindow):
         # Load environment variables
         load_dotenv()
         
-        # Initialize components
-        self.twitter_api = TwitterAPI()
-        self.content_generator = ContentGenerator()
-        self.image_generator = ImageGenerator()
+        # Components and the posting worker are created on first use
+        self.twitter_api = None
+        self.content_generator = None
+        self.image_generator = None
+        self.posting_worker = None
         
         # Initialize workers
-        self.posting_worker = PostingWorker(
-            self.twitter_api,
-            self.content_generator,
-            self.image_generator
-        )
-        self.schedule_worker = ScheduleWorker()
+        self.schedule_worker = ScheduleWorker(parent=self)
         
         # Connect worker signals
-        self.posting_worker.status_update.connect(self.update_status)
-        self.posting_worker.post_complete.connect(self.handle_post_complete)
-        self.posting_worker.post_error.connect(self.handle_post_error)
-        
         self.schedule_worker.schedule_update.connect(self.update_schedule_status)
         self.schedule_worker.trigger_post.connect(self.trigger_post)
         
+        # Non-secret settings live in the platform's native settings store,
+        # which only rewrites the keys that change
+        self.qsettings = QSettings("AIInfluencer", "GUI")
+        
+        # Credentials as last saved, to skip rewriting unchanged secrets
+        self._saved_credentials = None
+        
+        # Credentials as last applied to the components
+        self._applied_twitter_credentials = None
+        self._applied_openai_key = None
+        
+        # Tweet history, kept in memory and written to disk in the background
+        self._history = []
+        self._io_pool = QThreadPool(self)
+        self._io_pool.setMaxThreadCount(1)  # Keep history writes in order
+        
+        # History export running on its own thread, if any
+        self._export_thread = None
+        self._export_worker = None
+        self._export_progress = None
+        
+        # Activity log lines are buffered and flushed at most ~30 times a second
+        self._log_buffer = []
+        self._log_second = 0
+        self._log_timestamp = ''
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.setInterval(33)
+        self._log_flush_timer.timeout.connect(self._flush_activity_log)
+        
         # Initialize UI
         self.init_ui()
         
         # Load saved data
         self.load_data()
         
+        # Decode images once the window is up, keeping up to 64 MB of them
+        QPixmapCache.setCacheLimit(65536)
+        QTimer.singleShot(0, self._preload_assets)
+        
         # Start schedule worker
         self.schedule_worker.start()
     
@@ -388,9 +740,13 @@ class AIInfluencerGUI(QMainWindow):
         for category in ["Bitcoin", "Lightning Network", "Nostr", "Privacy", "Node Setup"]:
             checkbox = QCheckBox(category)
             checkbox.setChecked(True)
+            checkbox.toggled.connect(self.update_topic_preference)
             topics_layout.addWidget(checkbox)
             self.topic_checkboxes[category] = checkbox
         
+        # Enabled categories, kept in sync by update_topic_preference
+        self._enabled_categories = set(self.topic_checkboxes)
+        
         layout.addWidget(topics_group)
         
         # Posting schedule section
@@ -434,10 +790,23 @@ class AIInfluencerGUI(QMainWindow):
         layout = QVBoxLayout(history_tab)
         
         # Create table for tweet history
-        self.history_table = QTableWidget()
-        self.history_table.setColumnCount(5)
-        self.history_table.setHorizontalHeaderLabels(["Date", "Category", "Topic", "Content", "Actions"])
-        self.history_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
+        self.history_model = HistoryTableModel(self)
+        self.history_model.set_history(self._history)
+        self.history_table = QTableView()
+        self.history_table.setModel(self.history_model)
+        
+        # Fixed initial column widths, so refreshes never measure cell contents
+        header = self.history_table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        for column, width in enumerate((130, 100, 160, 500, 80)):
+            header.resizeSection(column, width)
+        header.setSectionResizeMode(3, QHeaderView.Stretch)
+        
+        # Draw the "View" buttons with a delegate instead of per-row widgets
+        view_delegate = ViewButtonDelegate(self.history_table)
+        view_delegate.view_requested.connect(self.view_post)
+        self.history_table.setItemDelegateForColumn(4, view_delegate)
+        self.history_table.doubleClicked.connect(self._on_history_row_activated)
         
         layout.addWidget(self.history_table)
         
@@ -467,7 +836,9 @@ class AIInfluencerGUI(QMainWindow):
         general_layout = QFormLayout(general_group)
         
         self.data_dir_input = QLineEdit()
+        self.data_dir_input.textChanged.connect(self._recompute_paths)
         self.data_dir_input.setText(os.path.join(os.path.dirname(__file__), 'data'))
+        self.data_dir_input.editingFinished.connect(self.update_data_dir)
         general_layout.addRow("Data Directory:", self.data_dir_input)
         
         self.browse_data_dir_button = QPushButton("Browse...")
@@ -482,6 +853,7 @@ class AIInfluencerGUI(QMainWindow):
         
         self.image_format_combo = QComboBox()
         self.image_format_combo.addItems(["Twitter (1200x675)", "Square (1080x1080)", "Portrait (1080x1350)"])
+        self.image_format_combo.currentIndexChanged.connect(self.update_image_format)
         image_layout.addRow("Image Format:", self.image_format_combo)
         
         layout.addWidget(image_group)
@@ -508,81 +880,202 @@ class AIInfluencerGUI(QMainWindow):
         data_dir = os.path.join(os.path.dirname(__file__), 'data')
         os.makedirs(data_dir, exist_ok=True)
         
-        # Load API credentials
-        credentials_file = os.path.join(data_dir, 'credentials.json')
-        if os.path.exists(credentials_file):
+        # List the data files with a single directory scan
+        with os.scandir(data_dir) as it:
+            entries = {entry.name: entry.path for entry in it if entry.is_file()}
+        
+        # Load API credentials from the keyring, falling back to a credentials
+        # file written by older versions or on systems without a keyring
+        credentials = self._load_keyring_credentials()
+        if credentials:
+            self._saved_credentials = dict(credentials)
+        
+        if 'credentials.json' in entries:
+            try:
+                with open(entries['credentials.json'], 'rb') as f:
+                    credentials = {**_json_loads(f.read()), **credentials}
+            except Exception as e:
+                logger.error(f"Error loading credentials: {str(e)}")
+        
+        if credentials:
             try:
-                with open(credentials_file, 'r') as f:
-                    credentials = json.load(f)
-                
                 # Set Twitter API credentials
                 self.api_key_input.setText(credentials.get('twitter_api_key', ''))
                 self.api_secret_input.setText(credentials.get('twitter_api_secret', ''))
                 self.access_token_input.setText(credentials.get('twitter_access_token', ''))
                 self.access_token_secret_input.setText(credentials.get('twitter_access_token_secret', ''))
                 
-                # Set OpenAI API key
+                # Set OpenAI API key; the components pick the credentials up
+                # when they are created on first use
                 self.openai_api_key_input.setText(credentials.get('openai_api_key', ''))
                 
-                # Apply credentials to components
-                self.apply_credentials()
-                
-                logger.info("Loaded credentials from file")
+                logger.info("Loaded credentials")
             except Exception as e:
                 logger.error(f"Error loading credentials: {str(e)}")
         
-        # Load settings
-        settings_file = os.path.join(data_dir, 'settings.json')
-        if os.path.exists(settings_file):
-            try:
-                with open(settings_file, 'r') as f:
-                    settings = json.load(f)
-                
-                # Apply settings
-                self.posting_interval.setValue(settings.get('posting_interval', 24))
-                self.auto_posting.setChecked(settings.get('auto_posting', True))
-                self.data_dir_input.setText(settings.get('data_dir', data_dir))
-                
-                # Apply topic preferences
-                for category, checkbox in self.topic_checkboxes.items():
-                    enabled = settings.get('topics', {}).get(category, True)
-                    checkbox.setChecked(enabled)
-                
-                # Apply image format
-                format_index = settings.get('image_format', 0)
-                self.image_format_combo.setCurrentIndex(format_index)
-                
-                logger.info("Loaded settings from file")
-            except Exception as e:
-                logger.error(f"Error loading settings: {str(e)}")
+        # Load settings, importing a settings.json written by older versions
+        if 'settings.json' in entries and not self.qsettings.contains('posting_interval'):
+            self._migrate_settings(entries['settings.json'])
         
-        # Load tweet history
-        history_file = os.path.join(data_dir, 'history.json')
-        if os.path.exists(history_file):
+        try:
+            settings = self.qsettings
+            
+            # Apply settings
+            self.posting_interval.setValue(settings.value('posting_interval', 24, int))
+            self.auto_posting.setChecked(settings.value('auto_posting', True, bool))
+            self.data_dir_input.setText(settings.value('data_dir', data_dir, str))
+            
+            # Apply topic preferences
+            for category, checkbox in self.topic_checkboxes.items():
+                checkbox.setChecked(settings.value(f'topics/{category}', True, bool))
+            
+            # Apply image format
+            self.image_format_combo.setCurrentIndex(settings.value('image_format', 0, int))
+            
+            logger.info("Loaded settings")
+        except Exception as e:
+            logger.error(f"Error loading settings: {str(e)}")
+        
+        # Load tweet history, converting a history.json from older versions
+        history_file = os.path.join(data_dir, 'history.jsonl')
+        if 'history.jsonl' not in entries and 'history.json' in entries:
+            if self._migrate_history(entries['history.json'], history_file):
+                entries['history.jsonl'] = history_file
+        
+        if 'history.jsonl' in entries:
             try:
-                with open(history_file, 'r') as f:
-                    history = json.load(f)
+                with open(history_file, 'rb') as f:
+                    self._history = [_json_loads(line) for line in f if line.strip()]
                 
                 # Populate history table
-                self.update_history_table(history)
+                self.update_history_table(self._history)
                 
                 # Add to activity log
-                if history:
-                    last_post = history[-1]
+                if self._history:
+                    last_post = self._history[-1]
                     self.add_activity_log(f"Last post: {last_post.get('timestamp')} - {last_post.get('category')}: {last_post.get('topic')}")
                 
                 logger.info("Loaded tweet history from file")
             except Exception as e:
                 logger.error(f"Error loading tweet history: {str(e)}")
     
+    def _migrate_history(self, legacy_history_file: str, history_file: str) -> bool:
+        """
+        Convert a JSON array history file to line-delimited JSON.
+        
+        The posts are written to a temporary file that only replaces the
+        history file once every post is converted, so a failed conversion is
+        retried on the next start instead of leaving a truncated history.
+        
+        Args:
+            legacy_history_file: Path to the history.json file
+            history_file: Path to the history.jsonl file to create
+            
+        Returns:
+            bool: True if the history was converted, False otherwise
+        """
+        tmp_path = history_file + '.tmp'
+        try:
+            with open(legacy_history_file, 'rb') as src, open(tmp_path, 'wb') as f:
+                # Stream the posts when ijson is available instead of
+                # materializing the whole array
+                if ijson:
+                    history = ijson.items(src, 'item', use_float=True)
+                else:
+                    history = _json_loads(src.read())
+                
+                for post in history:
+                    f.write(_json_dumps(post) + b'\n')
+                
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, history_file)
+            
+            logger.info("Converted tweet history to JSON lines")
+            return True
+        except Exception as e:
+            logger.error(f"Error converting tweet history: {str(e)}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
+    
+    def _migrate_settings(self, settings_file: str):
+        """
+        Import a settings.json file into the native settings store.
+        
+        Args:
+            settings_file: Path to the settings.json file
+        """
+        try:
+            with open(settings_file, 'rb') as f:
+                settings = _json_loads(f.read())
+            
+            for key in ('posting_interval', 'auto_posting', 'data_dir', 'image_format'):
+                if key in settings:
+                    self.qsettings.setValue(key, settings[key])
+            
+            for category, enabled in settings.get('topics', {}).items():
+                self.qsettings.setValue(f'topics/{category}', enabled)
+            
+            logger.info("Imported settings from file")
+        except Exception as e:
+            logger.error(f"Error importing settings: {str(e)}")
+    
+    def _load_keyring_credentials(self) -> Dict[str, str]:
+        """
+        Load the API credentials stored in the OS keyring.
+        
+        Returns:
+            dict: Stored credentials by name, empty if no keyring is available
+        """
+        credentials = {}
+        if keyring is None:
+            return credentials
+        
+        try:
+            for name in CREDENTIAL_NAMES:
+                value = keyring.get_password(KEYRING_SERVICE, name)
+                if value is not None:
+                    credentials[name] = value
+        except Exception as e:
+            logger.warning(f"Could not read credentials from keyring: {str(e)}")
+        
+        return credentials
+    
+    def _save_keyring_credentials(self, credentials: Dict[str, str]) -> bool:
+        """
+        Store the API credentials in the OS keyring.
+        
+        Args:
+            credentials: Credentials by name
+            
+        Returns:
+            bool: True if stored, False if no usable keyring is available
+        """
+        if keyring is None:
+            return False
+        
+        try:
+            for name, value in credentials.items():
+                keyring.set_password(KEYRING_SERVICE, name, value)
+            return True
+        except Exception as e:
+            logger.warning(f"Could not store credentials in keyring: {str(e)}")
+            return False
+    
     def save_data(self):
-        """Save data and settings."""
+        """Save credentials and settings."""
+        self.save_credentials()
+        self.save_settings()
+    
+    def save_credentials(self):
+        """Save the API credentials, preferring the keyring over a plaintext file."""
         # Create data directory if it doesn't exist
-        data_dir = self.data_dir_input.text()
-        os.makedirs(data_dir, exist_ok=True)
+        os.makedirs(self._data_dir, exist_ok=True)
         
-        # Save API credentials
-        credentials_file = os.path.join(data_dir, 'credentials.json')
+        credentials_file = self._credentials_path
         try:
             credentials = {
                 'twitter_api_key': self.api_key_input.text(),
@@ -592,59 +1085,112 @@ class AIInfluencerGUI(QMainWindow):
                 'openai_api_key': self.openai_api_key_input.text()
             }
             
-            with open(credentials_file, 'w') as f:
-                json.dump(credentials, f, indent=2)
-            
-            logger.info("Saved credentials to file")
+            if credentials == self._saved_credentials:
+                pass  # Unchanged since the last save
+            elif self._save_keyring_credentials(credentials):
+                self._saved_credentials = credentials
+                
+                # Remove any plaintext copy left by older versions
+                if os.path.exists(credentials_file):
+                    os.remove(credentials_file)
+                
+                logger.info("Saved credentials to keyring")
+            else:
+                _atomic_write(credentials_file, _json_dumps(credentials, indent=True))
+                self._saved_credentials = credentials
+                
+                logger.info("Saved credentials to file")
         except Exception as e:
             logger.error(f"Error saving credentials: {str(e)}")
+    
+    def save_settings(self):
+        """Flush pending settings changes to the native settings store."""
+        self.qsettings.sync()
+        logger.info("Saved settings")
+    
+    def save_history(self):
+        """Rewrite the history file from the in-memory history on the I/O thread."""
+        data_dir = self._data_dir
+        history_file = self._history_path
+        data = b''.join(_json_dumps(post) + b'\n' for post in self._history)
         
-        # Save settings
-        settings_file = os.path.join(data_dir, 'settings.json')
-        try:
-            # Get topic preferences
-            topics = {}
-            for category, checkbox in self.topic_checkboxes.items():
-                topics[category] = checkbox.isChecked()
-            
-            settings = {
-                'posting_interval': self.posting_interval.value(),
-                'auto_posting': self.auto_posting.isChecked(),
-                'data_dir': data_dir,
-                'topics': topics,
-                'image_format': self.image_format_combo.currentIndex()
-            }
-            
-            with open(settings_file, 'w') as f:
-                json.dump(settings, f, indent=2)
-            
-            logger.info("Saved settings to file")
-        except Exception as e:
-            logger.error(f"Error saving settings: {str(e)}")
+        def save():
+            try:
+                os.makedirs(data_dir, exist_ok=True)
+                _atomic_write(history_file, data)
+                
+                logger.info("Saved history to file")
+            except Exception as e:
+                logger.error(f"Error saving history: {str(e)}")
+        
+        self._io_pool.start(save)
+    
+    def _ensure_backends(self):
+        """Create the components and the posting worker on first use."""
+        if self.posting_worker is not None:
+            return
+        
+        from twitter_api import TwitterAPI
+        from content_generator import ContentGenerator
+        from image_generator import ImageGenerator
+        
+        # Initialize components
+        self.twitter_api = TwitterAPI()
+        self.content_generator = ContentGenerator()
+        self.image_generator = ImageGenerator()
+        
+        # Initialize posting worker
+        self.posting_worker = PostingWorker(
+            self.twitter_api,
+            self.content_generator,
+            self.image_generator
+        )
+        
+        # Connect worker signals
+        self.posting_worker.status_update.connect(self.update_status)
+        self.posting_worker.post_complete.connect(self.handle_post_complete)
+        self.posting_worker.post_error.connect(self.handle_post_error)
+        
+        # Push the credentials loaded at startup or entered since
+        self.apply_credentials()
     
     def apply_credentials(self):
         """Apply the entered credentials to the components."""
-        # Set Twitter API credentials
-        self.twitter_api.set_credentials(
-            api_key=self.api_key_input.text(),
-            api_secret=self.api_secret_input.text(),
-            access_token=self.access_token_input.text(),
-            access_token_secret=self.access_token_secret_input.text()
+        self._ensure_backends()
+        
+        # Set Twitter API credentials if they changed
+        credentials = (
+            self.api_key_input.text(),
+            self.api_secret_input.text(),
+            self.access_token_input.text(),
+            self.access_token_secret_input.text()
         )
+        if credentials != self._applied_twitter_credentials:
+            self.twitter_api.set_credentials(*credentials)
+            self._applied_twitter_credentials = credentials
         
         # Set OpenAI API key
-        self.content_generator.set_api_key(self.openai_api_key_input.text())
+        self.apply_openai_key()
+    
+    def apply_openai_key(self):
+        """Apply the entered OpenAI API key if it changed."""
+        self._ensure_backends()
+        
+        api_key = self.openai_api_key_input.text()
+        if api_key != self._applied_openai_key:
+            self.content_generator.set_api_key(api_key)
+            self._applied_openai_key = api_key
     
     def save_api_credentials(self):
         """Save the API credentials."""
         self.apply_credentials()
-        self.save_data()
+        self.save_credentials()
         QMessageBox.information(self, "Success", "Twitter API credentials saved successfully.")
     
     def save_openai_credentials(self):
         """Save the OpenAI API credentials."""
-        self.content_generator.set_api_key(self.openai_api_key_input.text())
-        self.save_data()
+        self.apply_openai_key()
+        self.save_credentials()
         QMessageBox.information(self, "Success", "OpenAI API key saved successfully.")
     
     def test_api_connection(self):
@@ -703,11 +1249,26 @@ class AIInfluencerGUI(QMainWindow):
         Args:
             message: Log message
         """
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.activity_text.append(f"[{timestamp}] {message}")
+        # Format the timestamp at most once per second
+        now = int(time.time())
+        if now != self._log_second:
+            self._log_second = now
+            self._log_timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+        
+        self._log_buffer.append(f"[{self._log_timestamp}] {message}")
+        if not self._log_flush_timer.isActive():
+            self._log_flush_timer.start()
+    
+    def _flush_activity_log(self):
+        """Append the buffered log lines to the activity log in one update."""
+        if self._log_buffer:
+            self.activity_text.append('\n'.join(self._log_buffer))
+            self._log_buffer.clear()
     
     def post_now(self):
         """Manually trigger a post."""
+        self._ensure_backends()
+        
         # Check if already posting
         if self.posting_worker.isRunning():
             QMessageBox.warning(self, "Posting in Progress", "A post is already being created. Please wait.")
@@ -730,7 +1291,7 @@ class AIInfluencerGUI(QMainWindow):
     def trigger_post(self):
         """Trigger a post from the scheduler."""
         # Only post if auto-posting is enabled
-        if self.auto_posting.isChecked() and not self.posting_worker.isRunning():
+        if self.auto_posting.isChecked() and not (self.posting_worker and self.posting_worker.isRunning()):
             self.post_now()
     
     def handle_post_complete(self, result: Dict):
@@ -746,10 +1307,8 @@ class AIInfluencerGUI(QMainWindow):
         # Update status
         self.update_status(f"Post created successfully! Tweet ID: {result['tweet_id']}")
         
-        # Save image to data directory
-        data_dir = self.data_dir_input.text()
-        images_dir = os.path.join(data_dir, 'images')
-        os.makedirs(images_dir, exist_ok=True)
+        # Save image to data directory (created on first use)
+        images_dir = self._images_dir
         
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         image_filename = f"tweet_{timestamp}"
@@ -762,11 +1321,8 @@ class AIInfluencerGUI(QMainWindow):
         
         result['saved_image'] = saved_image
         
-        # Add to history
+        # Add to history (appends to history.jsonl)
         self.add_to_history(result)
-        
-        # Save data
-        self.save_data()
     
     def handle_post_error(self, error_message: str):
         """
@@ -791,32 +1347,33 @@ class AIInfluencerGUI(QMainWindow):
         Args:
             post_data: Post data
         """
-        # Load existing history
-        data_dir = self.data_dir_input.text()
-        history_file = os.path.join(data_dir, 'history.json')
+        # Add new post; the table shares the history list and inserts one row
+        self.history_model.append_post(post_data)
         
-        history = []
-        if os.path.exists(history_file):
-            try:
-                with open(history_file, 'r') as f:
-                    history = json.load(f)
-            except Exception as e:
-                logger.error(f"Error loading history: {str(e)}")
+        # Save history off the GUI thread
+        self._append_history_async(post_data)
+    
+    def _append_history_async(self, post_data: Dict):
+        """
+        Append a post to the history file on the I/O thread.
         
-        # Add new post
-        history.append(post_data)
+        Args:
+            post_data: Post data
+        """
+        history_file = self._history_path
+        line = _json_dumps(post_data) + b'\n'
         
-        # Save history
-        try:
-            with open(history_file, 'w') as f:
-                json.dump(history, f, indent=2)
-            
-            logger.info("Saved post to history")
-        except Exception as e:
-            logger.error(f"Error saving history: {str(e)}")
+        def save():
+            try:
+                os.makedirs(os.path.dirname(history_file), exist_ok=True)
+                with open(history_file, 'ab') as f:
+                    f.write(line)
+                
+                logger.info("Saved post to history")
+            except Exception as e:
+                logger.error(f"Error saving history: {str(e)}")
         
-        # Update history table
-        self.update_history_table(history)
+        self._io_pool.start(save)
     
     def update_history_table(self, history: List[Dict]):
         """
@@ -825,94 +1382,50 @@ class AIInfluencerGUI(QMainWindow):
         Args:
             history: List of post history items
         """
-        # Clear table
-        self.history_table.setRowCount(0)
-        
-        # Add rows
-        for i, post in enumerate(reversed(history)):  # Show newest first
-            self.history_table.insertRow(i)
-            
-            # Date
-            timestamp = post.get('timestamp', '')
-            if timestamp:
-                try:
-                    dt = datetime.datetime.fromisoformat(timestamp)
-                    timestamp = dt.strftime("%Y-%m-%d %H:%M")
-                except:
-                    pass
-            
-            self.history_table.setItem(i, 0, QTableWidgetItem(timestamp))
-            
-            # Category
-            self.history_table.setItem(i, 1, QTableWidgetItem(post.get('category', '')))
-            
-            # Topic
-            self.history_table.setItem(i, 2, QTableWidgetItem(post.get('topic', '')))
-            
-            # Content
-            self.history_table.setItem(i, 3, QTableWidgetItem(post.get('text', '')))
-            
-            # Actions
-            actions_widget = QWidget()
-            actions_layout = QHBoxLayout(actions_widget)
-            actions_layout.setContentsMargins(2, 2, 2, 2)
-            
-            view_button = QPushButton("View")
-            view_button.setProperty("post_index", i)
-            view_button.clicked.connect(self.view_post)
-            actions_layout.addWidget(view_button)
-            
-            self.history_table.setCellWidget(i, 4, actions_widget)
-        
-        # Resize columns
-        self.history_table.resizeColumnsToContents()
+        self.history_model.set_history(history)
     
-    def view_post(self):
-        """View details of a selected post."""
-        # Get the post index from the sender button
-        sender = self.sender()
-        if not sender or not hasattr(sender, 'property'):
-            return
-        
-        post_index = sender.property("post_index")
-        if post_index is None:
-            return
+    def _on_history_row_activated(self, index: QModelIndex):
+        """
+        View the post of a double-clicked history row.
         
-        # Load history
-        data_dir = self.data_dir_input.text()
-        history_file = os.path.join(data_dir, 'history.json')
+        Args:
+            index: Model index of the clicked cell
+        """
+        self.view_post(index.row())
+    
+    def view_post(self, post_index: int):
+        """
+        View details of a post.
         
+        Args:
+            post_index: Row of the post in the history table (newest first)
+        """
         try:
-            with open(history_file, 'r') as f:
-                history = json.load(f)
-            
-            # Get the post (accounting for reversed display)
-            post = history[len(history) - 1 - post_index]
+            post = self.history_model.post(post_index)
             
             # Create dialog to show post details
             dialog = QMessageBox(self)
             dialog.setWindowTitle("Post Details")
             
             # Format post details
-            details = f"Date: {post.get('timestamp', '')}\n"
-            details += f"Category: {post.get('category', '')}\n"
-            details += f"Topic: {post.get('topic', '')}\n\n"
-            details += f"Content: {post.get('text', '')}\n\n"
-            details += f"Hashtags: {' '.join(post.get('hashtags', []))}\n\n"
-            details += f"Tweet ID: {post.get('tweet_id', '')}"
+            details = "\n".join([
+                f"Date: {post.get('timestamp', '')}",
+                f"Category: {post.get('category', '')}",
+                f"Topic: {post.get('topic', '')}",
+                "",
+                f"Content: {post.get('text', '')}",
+                "",
+                f"Hashtags: {' '.join(post.get('hashtags', []))}",
+                "",
+                f"Tweet ID: {post.get('tweet_id', '')}"
+            ])
             
             dialog.setText(details)
             
             # Show image if available
-            image_path = post.get('saved_image', '')
-            if image_path and os.path.exists(image_path):
-                pixmap = QPixmap(image_path)
-                if not pixmap.isNull():
-                    # Scale down if too large
-                    if pixmap.width() > 400:
-                        pixmap = pixmap.scaledToWidth(400, Qt.SmoothTransformation)
-                    
-                    dialog.setIconPixmap(pixmap)
+            pixmap = self._post_pixmap(post.get('saved_image', ''))
+            if pixmap is not None:
+                dialog.setIconPixmap(pixmap)
             
             dialog.exec_()
             
@@ -920,40 +1433,69 @@ class AIInfluencerGUI(QMainWindow):
             logger.error(f"Error viewing post: {str(e)}")
             QMessageBox.critical(self, "Error", f"Error viewing post: {str(e)}")
     
+    def _post_pixmap(self, image_path: str, width: int = 400) -> Optional[QPixmap]:
+        """
+        Get the preview pixmap of a post image, decoding it only once.
+        
+        The cache key includes the file's modification time, so a replaced
+        image is decoded again.
+        
+        Args:
+            image_path: Path to the saved image
+            width: Maximum width of the pixmap
+            
+        Returns:
+            QPixmap: Pixmap scaled to at most the given width, or None if unavailable
+        """
+        if not image_path:
+            return None
+        
+        try:
+            mtime = os.stat(image_path).st_mtime_ns
+        except OSError:
+            return None
+        
+        key = f"post:{image_path}:{mtime}:{width}"
+        pixmap = QPixmapCache.find(key)
+        if pixmap is not None:
+            return pixmap
+        
+        pixmap = QPixmap(image_path)
+        if pixmap.isNull():
+            return None
+        
+        # Scale down if too large
+        if pixmap.width() > width:
+            pixmap = pixmap.scaledToWidth(width, Qt.SmoothTransformation)
+        
+        QPixmapCache.insert(key, pixmap)
+        return pixmap
+    
+    def _preload_assets(self):
+        """Decode the newest post image into the pixmap cache."""
+        if self._history:
+            self._post_pixmap(self._history[-1].get('saved_image', ''))
+    
     def view_last_post(self):
         """View the most recent post."""
-        # Load history
-        data_dir = self.data_dir_input.text()
-        history_file = os.path.join(data_dir, 'history.json')
-        
         try:
-            with open(history_file, 'r') as f:
-                history = json.load(f)
+            history = self._history
             
             if not history:
                 QMessageBox.information(self, "No Posts", "No posts have been made yet.")
                 return
             
-            # Create a button with the index of the last post
-            button = QPushButton()
-            button.setProperty("post_index", 0)  # First row in the table (newest post)
-            
-            # Call view_post
-            self.view_post.__get__(button, QPushButton)()
-            
+            # The newest post is the first row in the table
+            self.view_post(0)
+        
         except Exception as e:
             logger.error(f"Error viewing last post: {str(e)}")
             QMessageBox.critical(self, "Error", f"Error viewing last post: {str(e)}")
     
     def export_history(self):
         """Export tweet history to a file."""
-        # Load history
-        data_dir = self.data_dir_input.text()
-        history_file = os.path.join(data_dir, 'history.json')
-        
         try:
-            with open(history_file, 'r') as f:
-                history = json.load(f)
+            history = self._history
             
             if not history:
                 QMessageBox.information(self, "No Data", "No posts to export.")
@@ -970,26 +1512,57 @@ class AIInfluencerGUI(QMainWindow):
             if not file_path:
                 return
             
-            # Export to CSV
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                f.write("Date,Category,Topic,Content,Hashtags,Tweet ID\n")
-                
-                for post in history:
-                    date = post.get('timestamp', '')
-                    category = post.get('category', '').replace('"', '""')
-                    topic = post.get('topic', '').replace('"', '""')
-                    content = post.get('text', '').replace('"', '""')
-                    hashtags = ' '.join(post.get('hashtags', [])).replace('"', '""')
-                    tweet_id = post.get('tweet_id', '')
-                    
-                    f.write(f'"{date}","{category}","{topic}","{content}","{hashtags}","{tweet_id}"\n')
+            # Export to CSV on a worker thread
+            self._export_worker = ExportWorker(list(history), file_path)
+            self._export_thread = QThread(self)
+            self._export_worker.moveToThread(self._export_thread)
+            self._export_thread.started.connect(self._export_worker.run)
+            self._export_worker.finished.connect(self.handle_export_complete)
+            self._export_worker.error.connect(self.handle_export_error)
             
-            QMessageBox.information(self, "Export Successful", f"Tweet history exported to {file_path}")
+            self._export_progress = QProgressDialog("Exporting tweet history...", None, 0, 0, self)
+            self._export_progress.setWindowTitle("Export History")
+            self._export_progress.setWindowModality(Qt.WindowModal)
+            self._export_progress.show()
             
+            self.export_history_button.setEnabled(False)
+            self._export_thread.start()
+        
         except Exception as e:
             logger.error(f"Error exporting history: {str(e)}")
             QMessageBox.critical(self, "Error", f"Error exporting history: {str(e)}")
     
+    def _finish_export(self):
+        """Stop the export thread and restore the UI."""
+        self._export_thread.quit()
+        self._export_thread.wait()
+        self._export_thread = None
+        self._export_worker = None
+        
+        self._export_progress.close()
+        self._export_progress = None
+        self.export_history_button.setEnabled(True)
+    
+    def handle_export_complete(self, file_path: str):
+        """
+        Handle a finished history export.
+        
+        Args:
+            file_path: Path of the written CSV file
+        """
+        self._finish_export()
+        QMessageBox.information(self, "Export Successful", f"Tweet history exported to {file_path}")
+    
+    def handle_export_error(self, error_message: str):
+        """
+        Handle a failed history export.
+        
+        Args:
+            error_message: Error message
+        """
+        self._finish_export()
+        QMessageBox.critical(self, "Error", f"Error exporting history: {error_message}")
+    
     def clear_history(self):
         """Clear tweet history."""
         # Confirm with user
@@ -1004,16 +1577,13 @@ class AIInfluencerGUI(QMainWindow):
         if reply != QMessageBox.Yes:
             return
         
-        # Clear history file
-        data_dir = self.data_dir_input.text()
-        history_file = os.path.join(data_dir, 'history.json')
-        
         try:
-            with open(history_file, 'w') as f:
-                json.dump([], f)
+            # Clear history file
+            self._history = []
+            self.save_history()
             
             # Clear table
-            self.history_table.setRowCount(0)
+            self.history_model.set_history(self._history)
             
             QMessageBox.information(self, "History Cleared", "Tweet history has been cleared.")
             
@@ -1026,18 +1596,12 @@ class AIInfluencerGUI(QMainWindow):
         # Apply current credentials
         self.apply_credentials()
         
-        # Get enabled categories
-        enabled_categories = []
-        for category, checkbox in self.topic_checkboxes.items():
-            if checkbox.isChecked():
-                enabled_categories.append(category)
-        
-        if not enabled_categories:
+        if not self._enabled_categories:
             QMessageBox.warning(self, "No Categories", "Please enable at least one topic category.")
             return
         
-        # Select a random category
-        category = random.choice(enabled_categories)
+        # Select a random enabled category
+        category = random.choice(tuple(self._enabled_categories))
         
         # Generate content
         try:
@@ -1051,11 +1615,17 @@ class AIInfluencerGUI(QMainWindow):
                 content = self.content_generator.generate_content_without_api(category=category)
             
             # Display preview
-            preview_text = f"Category: {content['category']}\n"
-            preview_text += f"Topic: {content['topic']}\n\n"
-            preview_text += f"Text: {content['text']}\n\n"
-            preview_text += f"Hashtags: {' '.join(content['hashtags'][:15])}\n\n"
-            preview_text += f"Full post:\n{content['full_text_with_hashtags']}"
+            preview_text = "\n".join([
+                f"Category: {content['category']}",
+                f"Topic: {content['topic']}",
+                "",
+                f"Text: {content['text']}",
+                "",
+                f"Hashtags: {' '.join(content['hashtags'][:15])}",
+                "",
+                "Full post:",
+                content['full_text_with_hashtags']
+            ])
             
             self.content_preview.setText(preview_text)
             
@@ -1074,7 +1644,7 @@ class AIInfluencerGUI(QMainWindow):
             value: New interval in hours
         """
         self.schedule_worker.set_interval(value)
-        self.save_data()
+        self.qsettings.setValue('posting_interval', value)
     
     def toggle_auto_posting(self, state: int):
         """
@@ -1088,7 +1658,7 @@ class AIInfluencerGUI(QMainWindow):
         else:
             self.update_status("Automatic posting disabled")
         
-        self.save_data()
+        self.qsettings.setValue('auto_posting', state == Qt.Checked)
     
     def browse_data_dir(self):
         """Browse for data directory."""
@@ -1100,7 +1670,47 @@ class AIInfluencerGUI(QMainWindow):
         
         if directory:
             self.data_dir_input.setText(directory)
-            self.save_data()
+            self.update_data_dir()
+    
+    def _recompute_paths(self, data_dir: str):
+        """
+        Precompute the data file paths for a data directory.
+        
+        Args:
+            data_dir: Data directory
+        """
+        self._data_dir = data_dir
+        self._credentials_path = os.path.join(data_dir, 'credentials.json')
+        self._history_path = os.path.join(data_dir, 'history.jsonl')
+        self._images_dir = os.path.join(data_dir, 'images')
+    
+    def update_data_dir(self):
+        """Store the data directory setting."""
+        self.qsettings.setValue('data_dir', self.data_dir_input.text())
+    
+    def update_topic_preference(self, checked: bool):
+        """
+        Store the preference of the toggled topic checkbox.
+        
+        Args:
+            checked: Whether the topic is enabled
+        """
+        category = self.sender().text()
+        if checked:
+            self._enabled_categories.add(category)
+        else:
+            self._enabled_categories.discard(category)
+        
+        self.qsettings.setValue(f'topics/{category}', checked)
+    
+    def update_image_format(self, index: int):
+        """
+        Store the image format setting.
+        
+        Args:
+            index: Index of the selected image format
+        """
+        self.qsettings.setValue('image_format', index)
     
     def closeEvent(self, event):
         """Handle window close event."""
@@ -1108,9 +1718,16 @@ class AIInfluencerGUI(QMainWindow):
         self.save_data()
         
         # Stop workers
-        self.posting_worker.stop()
+        if self.posting_worker:
+            self.posting_worker.stop()
         self.schedule_worker.stop()
         
+        # Finish pending history writes and exports
+        self._io_pool.waitForDone()
+        if self._export_thread is not None:
+            self._export_thread.quit()
+            self._export_thread.wait()
+        
         # Accept the event
         event.accept()
 
@@ -12,18 +12,16 @@ This module handles the generation of images for the AI Influencer system, inclu
 """
 
 import os
+import errno
 import random
 import logging
+import shutil
 import tempfile
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Optional, Tuple, Union
-from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageEnhance
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
+from PIL import Image, ImageColor, ImageDraw, ImageFont, ImageFilter, ImageEnhance
 import numpy as np
-from io import BytesIO
-import requests
-from dotenv import load_dotenv
 
 # Configure logging
 logging.basicConfig(
@@ -36,6 +34,93 @@ logging.basicConfig(
 )
 logger = logging.getLogger("ImageGenerator")
 
+# Directories already created by this process, mapped to their device IDs
+_ready_dirs = {}
+
+
+def _ensure_dir(path: str, refresh: bool = False) -> int:
+    """
+    Create a directory the first time it is requested.
+    
+    Args:
+        path: Directory path
+        refresh: Forget what is cached for the directory and check it again,
+            e.g. after it was deleted or remounted
+            
+    Returns:
+        int: Device ID of the directory
+    """
+    if refresh:
+        _ready_dirs.pop(path, None)
+    device = _ready_dirs.get(path)
+    if device is None:
+        os.makedirs(path, exist_ok=True)
+        device = _ready_dirs[path] = os.stat(path).st_dev
+    return device
+
+
+def _move_file(source: str, destination: str, destination_device: int) -> None:
+    """
+    Move a file, renaming it when it already lives on the destination device.
+    
+    Args:
+        source: File to move
+        destination: New file path
+        destination_device: Device ID of the destination directory
+    """
+    # A rename copies no data
+    if os.stat(source).st_dev == destination_device:
+        os.replace(source, destination)
+    else:
+        shutil.copyfile(source, destination)
+        os.remove(source)
+
+
+def _pyplot():
+    """
+    Import matplotlib's pyplot on first use, with the non-interactive backend.
+    
+    Returns:
+        module: matplotlib.pyplot
+    """
+    import matplotlib
+    matplotlib.use('Agg')  # Use non-interactive backend
+    import matplotlib.pyplot as plt
+    return plt
+
+
+# Generator owned by a batch worker process, see ImageGenerator.generate_images_batch
+_batch_generator = None
+
+
+def _init_batch_worker(assets_dir: str) -> None:
+    """
+    Set up a batch worker process with its own generator and random state.
+    
+    Args:
+        assets_dir: Assets directory of the parent's generator
+    """
+    global _batch_generator
+    
+    # Forked workers inherit the parent's RNG state; reseed so their images differ
+    random.seed()
+    np.random.seed()
+    _batch_generator = ImageGenerator(assets_dir=assets_dir)
+
+
+def _generate_batch_image(args: Tuple[str, str, str]) -> str:
+    """
+    Generate one image in a batch worker process.
+    
+    Args:
+        args: (text, category, size_key)
+        
+    Returns:
+        str: Path to the generated image file
+    """
+    return _batch_generator.generate_image(*args)
+
+
 class ImageGenerator:
     """
     Class to handle image generation for the AI Influencer system.
@@ -70,6 +155,25 @@ class ImageGenerator:
         }
     }
     
+    # Parse each theme's hex colors once, for the PIL drawing code
+    for _theme in THEMES.values():
+        _theme["colors_rgb"] = [ImageColor.getrgb(color) for color in _theme["colors"]]
+    del _theme
+    
+    # HTTP session shared by all instances, created on the first download
+    _http = None
+    
+    # Whether the .env file has been loaded by an earlier instance
+    _dotenv_loaded = False
+    
+    # Maximum number of decoded asset pixels kept in memory, about sixteen
+    # Twitter-sized backgrounds
+    IMAGE_CACHE_PIXELS = 16 * 1200 * 675
+    
+    # JPEG encoder settings: baseline, 4:2:0 chroma, no extra Huffman pass
+    JPEG_OPTIONS = {"format": "JPEG", "quality": 90, "subsampling": 2,
+                    "optimize": False, "progressive": False}
+    
     # Define standard image sizes
     IMAGE_SIZES = {
         "twitter": (1200, 675),  # 16:9 aspect ratio for Twitter
@@ -84,22 +188,43 @@ class ImageGenerator:
         Args:
             assets_dir: Directory containing image assets (optional)
         """
-        # Load .env file if it exists
-        load_dotenv()
+        # Load .env file if it exists, once per process
+        if not ImageGenerator._dotenv_loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            ImageGenerator._dotenv_loaded = True
         
         # Set assets directory
         self.assets_dir = assets_dir or os.path.join(os.path.dirname(__file__), 'assets')
         
         # Create assets directory if it doesn't exist
-        os.makedirs(self.assets_dir, exist_ok=True)
-        os.makedirs(os.path.join(self.assets_dir, 'backgrounds'), exist_ok=True)
-        os.makedirs(os.path.join(self.assets_dir, 'icons'), exist_ok=True)
-        os.makedirs(os.path.join(self.assets_dir, 'fonts'), exist_ok=True)
+        for subdir in ('backgrounds', 'icons', 'fonts'):
+            _ensure_dir(os.path.join(self.assets_dir, subdir))
         
         # Initialize font paths
         self.font_regular = self._get_font_path('regular')
         self.font_bold = self._get_font_path('bold')
         
+        # Loaded fonts, keyed by (path, size)
+        self._font_cache = {}
+        
+        # Rendered category labels, keyed by (category, title font, body font),
+        # and watermarks with their text width, keyed by font
+        self._label_chips = {}
+        self._watermark_chips = {}
+        
+        # Decoded background and icon images keyed by (path, size), least
+        # recently used first, and their total number of pixels
+        self._image_cache = OrderedDict()
+        self._image_cache_pixels = 0
+        
+        # Matplotlib figure reused for every pie/polar chart, created on first use
+        self._chart_canvas = None
+        self._chart_lock = threading.Lock()
+        
+        # Index the background and icon files by category
+        self.refresh_assets()
+        
         logger.info(f"Initialized ImageGenerator with assets directory: {self.assets_dir}")
     
     def _get_font_path(self, font_type: str) -> str:
@@ -134,9 +259,7 @@ class ImageGenerator:
                 url = font_urls.get(font_type)
                 if url:
                     logger.info(f"Downloading font: {font_file}")
-                    response = requests.get(url)
-                    with open(font_path, 'wb') as f:
-                        f.write(response.content)
+                    self._download(url, font_path)
                     logger.info(f"Font downloaded: {font_path}")
                 else:
                     # Use default system font if URL not available
@@ -148,85 +271,231 @@ class ImageGenerator:
         
         return font_path
     
-    def _get_background_image(self, category: str) -> Optional[Image.Image]:
+    @classmethod
+    def _download(cls, url: str, path: str) -> None:
         """
-        Get a background image for the specified category.
+        Stream a remote file to disk over the shared HTTP session.
+        
+        The body is written to a temporary file next to the destination and
+        renamed into place, so a failed download leaves nothing behind.
         
         Args:
-            category: Topic category
+            url: URL to download
+            path: Destination file path
+        """
+        if cls._http is None:
+            import requests
+            cls._http = requests.Session()
+        
+        partial_path = path + '.part'
+        try:
+            with cls._http.get(url, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                with open(partial_path, 'wb') as f:
+                    shutil.copyfileobj(response.raw, f)
+            os.replace(partial_path, path)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+    
+    def _font(self, font_path: Optional[str], size: int) -> ImageFont.ImageFont:
+        """
+        Get a font, loading each font file and size only once.
+        
+        Args:
+            font_path: Path to the font file, or None for the default font
+            size: Font size
             
         Returns:
-            PIL.Image.Image: Background image
+            ImageFont: The loaded font
+        """
+        key = (font_path, size)
+        font = self._font_cache.get(key)
+        if font is None:
+            if font_path:
+                font = ImageFont.truetype(font_path, size=size)
+            else:
+                try:
+                    font = ImageFont.load_default(size=size)
+                except TypeError:
+                    font = ImageFont.load_default()  # Pillow < 10.1 has no sizes
+            self._font_cache[key] = font
+        return font
+    
+    def warmup(self) -> None:
         """
-        backgrounds_dir = os.path.join(self.assets_dir, 'backgrounds')
+        Load fonts and initialize the chart backend ahead of the first image.
         
-        # Get theme for the category
-        theme = self.THEMES.get(category, self.THEMES["Bitcoin"])
+        This has no side effects on the generated images, so it can run while
+        post content is still being generated.
+        """
+        try:
+            for font_path, size in ((self.font_bold, 48), (self.font_regular, 36), (self.font_regular, 24)):
+                self._font(font_path, size)
+            
+            with self._chart_lock:
+                self._chart_figure()
+            logger.info("ImageGenerator warmed up")
+        except Exception as e:
+            logger.error(f"Error warming up image generator: {str(e)}")
+    
+    def refresh_assets(self) -> None:
+        """
+        Scan the background and icon directories and index the files by category.
         
+        Call this after adding, removing or replacing asset files.
+        """
+        self._image_cache.clear()
+        self._image_cache_pixels = 0
+        self._bg_index, self._bg_files = self._build_asset_index(
+            'backgrounds', "backgrounds", ('.jpg', '.jpeg', '.png'))
+        self._icon_index, _ = self._build_asset_index('icons', "icons", ('.png', '.svg'))
+    
+    def _build_asset_index(self, subdir: str, theme_key: str,
+                           extensions: Tuple[str, ...]) -> Tuple[Dict[str, List[str]], List[str]]:
+        """
+        Match the files of an asset directory against each category's keywords.
+        
+        Args:
+            subdir: Asset subdirectory to scan
+            theme_key: Theme entry holding the keywords ('backgrounds' or 'icons')
+            extensions: Accepted lowercase file extensions, matched case-insensitively
+            
+        Returns:
+            tuple: Dict of category to matching paths, and the list of all asset paths
+        """
+        asset_dir = os.path.join(self.assets_dir, subdir)
+        # DirEntry carries the file type from the directory read, so there is
+        # no per-file stat
+        with os.scandir(asset_dir) as it:
+            files = [(name, entry.path) for entry in it
+                     for name in (entry.name.lower(),)
+                     if name.endswith(extensions) and entry.is_file()]
+        
+        # A file matching several keywords is listed once per keyword
+        index = {
+            category: [path for keyword in theme[theme_key] for name, path in files
+                       if keyword.lower() in name]
+            for category, theme in self.THEMES.items()
+        }
+        return index, [path for _, path in files]
+    
+    def _load_image(self, image_path: str,
+                    size: Optional[Tuple[int, int]] = None) -> Image.Image:
+        """
+        Open and decode an asset image, keeping recently used images in memory.
+        
+        With a size, the image is cropped and resized to it before caching, so
+        later calls skip the resampling and large originals are not kept. The
+        returned image is shared between calls and must not be modified in
+        place.
+        
+        Args:
+            image_path: Path to the image file
+            size: Size to crop and resize the image to (optional, defaults to
+                the original size)
+                
+        Returns:
+            PIL.Image.Image: Decoded image
+        """
+        key = (image_path, size)
+        image = self._image_cache.get(key)
+        if image is not None:
+            self._image_cache.move_to_end(key)
+            return image
+        
+        image = Image.open(image_path)
+        image.load()
+        if size:
+            image = self._fit_image(image, size)
+        
+        # Evict the least recently used images until the new one fits
+        self._image_cache[key] = image
+        self._image_cache_pixels += image.width * image.height
+        while self._image_cache_pixels > self.IMAGE_CACHE_PIXELS and len(self._image_cache) > 1:
+            _, evicted = self._image_cache.popitem(last=False)
+            self._image_cache_pixels -= evicted.width * evicted.height
+        return image
+    
+    def _get_background_image(self, category: str,
+                              size: Optional[Tuple[int, int]] = None) -> Optional[Image.Image]:
+        """
+        Get a background image for the specified category.
+        
+        Args:
+            category: Topic category
+            size: Size to generate a fallback background at (optional,
+                defaults to the Twitter size)
+                
+        Returns:
+            PIL.Image.Image: Background image
+        """
         # Look for background images matching the theme
-        background_files = []
-        for bg_type in theme["backgrounds"]:
-            # Check for files with the background type in the name
-            for file in os.listdir(backgrounds_dir):
-                if bg_type.lower() in file.lower() and file.endswith(('.jpg', '.jpeg', '.png')):
-                    background_files.append(os.path.join(backgrounds_dir, file))
+        background_files = self._bg_index.get(category, self._bg_index["Bitcoin"])
         
         # If no matching backgrounds found, use any available background
         if not background_files:
-            background_files = [os.path.join(backgrounds_dir, f) for f in os.listdir(backgrounds_dir)
-                              if f.endswith(('.jpg', '.jpeg', '.png'))]
+            background_files = self._bg_files
         
         # If still no backgrounds, generate a simple one
         if not background_files:
             logger.warning(f"No background images found for category: {category}, generating simple background")
-            return self._generate_simple_background(category)
+            return self._generate_simple_background(category, size)
         
         # Select a random background
         background_path = random.choice(background_files)
         
         try:
-            # Open and return the background image
-            return Image.open(background_path)
+            # Open and return the background image, fitted to the requested size
+            return self._load_image(background_path, size)
         except Exception as e:
             logger.error(f"Error opening background image: {str(e)}")
-            return self._generate_simple_background(category)
+            return self._generate_simple_background(category, size)
     
-    def _generate_simple_background(self, category: str) -> Image.Image:
+    def _generate_simple_background(self, category: str,
+                                    size: Optional[Tuple[int, int]] = None) -> Image.Image:
         """
         Generate a simple background image for the specified category.
         
         Args:
             category: Topic category
+            size: Image size (optional, defaults to the Twitter size)
             
         Returns:
             PIL.Image.Image: Generated background image
         """
         # Get theme colors for the category
         theme = self.THEMES.get(category, self.THEMES["Bitcoin"])
-        colors = theme["colors"]
+        colors = theme["colors_rgb"]
         
-        # Create a gradient background
-        width, height = self.IMAGE_SIZES["twitter"]
-        image = Image.new('RGB', (width, height), colors[0])
+        # Draw at a quarter of the final size; the heavy blur hides the
+        # upscaling and blurring the small canvas is much cheaper
+        width, height = size or self.IMAGE_SIZES["twitter"]
+        scale = 4
+        image = Image.new('RGB', (width // scale, height // scale), colors[0])
         draw = ImageDraw.Draw(image)
         
-        # Draw some random shapes for visual interest
-        for _ in range(20):
-            shape_type = random.choice(['circle', 'rectangle'])
-            color = random.choice(colors[1:])
-            x = random.randint(0, width)
-            y = random.randint(0, height)
-            size = random.randint(20, 200)
-            
-            if shape_type == 'circle':
-                draw.ellipse((x, y, x + size, y + size), fill=color)
+        # Draw some random shapes for visual interest, drawing all the
+        # shape parameters at once
+        count = 20
+        circles = np.random.randint(0, 2, count).tolist()
+        color_indices = np.random.randint(1, len(colors), count).tolist()
+        xs = (np.random.randint(0, width + 1, count) / scale).tolist()
+        ys = (np.random.randint(0, height + 1, count) / scale).tolist()
+        sizes = (np.random.randint(20, 201, count) / scale).tolist()
+        
+        for circle, color_index, x, y, shape_size in zip(circles, color_indices, xs, ys, sizes):
+            shape = (x, y, x + shape_size, y + shape_size)
+            if circle:
+                draw.ellipse(shape, fill=colors[color_index])
             else:
-                draw.rectangle((x, y, x + size, y + size), fill=color)
+                draw.rectangle(shape, fill=colors[color_index])
         
         # Apply blur to make it less harsh
-        image = image.filter(ImageFilter.GaussianBlur(radius=10))
+        image = image.filter(ImageFilter.GaussianBlur(radius=10 / scale))
         
-        return image
+        return image.resize((width, height), Image.BILINEAR)
     
     def _get_icon_image(self, category: str) -> Optional[Image.Image]:
         """
@@ -238,18 +507,8 @@ class ImageGenerator:
         Returns:
             PIL.Image.Image: Icon image or None if not found
         """
-        icons_dir = os.path.join(self.assets_dir, 'icons')
-        
-        # Get theme for the category
-        theme = self.THEMES.get(category, self.THEMES["Bitcoin"])
-        
         # Look for icon images matching the theme
-        icon_files = []
-        for icon_type in theme["icons"]:
-            # Check for files with the icon type in the name
-            for file in os.listdir(icons_dir):
-                if icon_type.lower() in file.lower() and file.endswith(('.png', '.svg')):
-                    icon_files.append(os.path.join(icons_dir, file))
+        icon_files = self._icon_index.get(category, self._icon_index["Bitcoin"])
         
         # If no matching icons found, return None
         if not icon_files:
@@ -260,27 +519,30 @@ class ImageGenerator:
         
         try:
             # Open and return the icon image
-            return Image.open(icon_path)
+            return self._load_image(icon_path)
         except Exception as e:
             logger.error(f"Error opening icon image: {str(e)}")
             return None
     
-    def _create_chart_image(self, category: str) -> Image.Image:
+    def _create_chart_image(self, category: str,
+                            size: Optional[Tuple[int, int]] = None) -> Image.Image:
         """
         Create a chart image for the specified category.
         
+        Line and bar charts are drawn directly with PIL; pie and polar charts
+        are rendered with matplotlib.
+        
         Args:
             category: Topic category
-            
+            size: Size to draw line and bar charts at (optional, defaults to
+                the Twitter size); matplotlib charts are always Twitter sized
+                
         Returns:
             PIL.Image.Image: Generated chart image
         """
         # Get theme colors for the category
         theme = self.THEMES.get(category, self.THEMES["Bitcoin"])
-        colors = theme["colors"]
-        
-        # Create a matplotlib figure
-        plt.figure(figsize=(12, 6.75), facecolor=colors[2])
+        colors = theme["colors_rgb"]
         
         # Generate random data based on category
         if category == "Bitcoin":
@@ -288,41 +550,202 @@ class ImageGenerator:
             days = 30
             x = np.arange(days)
             trend = np.cumsum(np.random.normal(0.5, 1, days))
-            plt.plot(x, trend, color=colors[0], linewidth=3)
-            plt.title("Bitcoin Price Trend", fontsize=24, color=colors[1])
-            plt.ylabel("Price (USD)", fontsize=16, color=colors[1])
-            plt.xlabel("Days", fontsize=16, color=colors[1])
-            
-        elif category == "Lightning Network":
+            return self._draw_xy_chart(
+                colors, "Bitcoin Price Trend", "Days", "Price (USD)",
+                [(x, trend, colors[0], None)], size=size
+            )
+        
+        if category == "Lightning Network":
             # Network growth
             x = np.arange(10)
             y = np.exp(x / 2) * 100
-            plt.bar(x, y, color=colors[0])
-            plt.title("Lightning Network Growth", fontsize=24, color=colors[1])
-            plt.ylabel("Nodes", fontsize=16, color=colors[1])
-            plt.xlabel("Time", fontsize=16, color=colors[1])
-            
-        elif category == "Nostr":
+            return self._draw_xy_chart(
+                colors, "Lightning Network Growth", "Time", "Nodes",
+                [(x, y, colors[0], None)], bars=True, size=size
+            )
+        
+        if category == "Nostr":
             # User adoption
             x = np.arange(12)
             y1 = np.exp(x / 4) * 50
             y2 = np.exp(x / 5) * 30
-            plt.plot(x, y1, color=colors[0], linewidth=3, label="Users")
-            plt.plot(x, y2, color=colors[3], linewidth=3, label="Relays")
-            plt.legend(fontsize=14)
-            plt.title("Nostr Ecosystem Growth", fontsize=24, color=colors[1])
-            plt.ylabel("Count", fontsize=16, color=colors[1])
-            plt.xlabel("Months", fontsize=16, color=colors[1])
-            
-        elif category == "Privacy":
+            return self._draw_xy_chart(
+                colors, "Nostr Ecosystem Growth", "Months", "Count",
+                [(x, y1, colors[0], "Users"), (x, y2, colors[3], "Relays")], size=size
+            )
+        
+        return self._create_matplotlib_chart(category, theme["colors"])
+    
+    def _draw_xy_chart(self, colors: List[Tuple[int, int, int]], title: str, xlabel: str, ylabel: str,
+                       series: List[Tuple[np.ndarray, np.ndarray, Tuple[int, int, int], Optional[str]]],
+                       bars: bool = False,
+                       size: Optional[Tuple[int, int]] = None) -> Image.Image:
+        """
+        Draw a line or bar chart directly onto an image.
+        
+        Args:
+            colors: Theme colors as RGB tuples
+            title: Chart title
+            xlabel: X axis label
+            ylabel: Y axis label
+            series: List of (x values, y values, color, legend label or None)
+            bars: Draw the first series as bars instead of lines
+            size: Image size (optional, defaults to the Twitter size)
+            
+        Returns:
+            PIL.Image.Image: Generated chart image
+        """
+        width, height = size or self.IMAGE_SIZES["twitter"]
+        image = Image.new('RGB', (width, height), colors[2])
+        draw = ImageDraw.Draw(image)
+        
+        title_font = self._font(self.font_bold, 33)
+        label_font = self._font(self.font_regular, 22)
+        tick_font = self._font(self.font_regular, 16)
+        
+        # Plot area
+        left, top, right, bottom = 110, 80, width - 40, height - 90
+        
+        # Data ranges, with a margin like matplotlib's autoscaling
+        x_min = min(float(x.min()) for x, _, _, _ in series)
+        x_max = max(float(x.max()) for x, _, _, _ in series)
+        y_min = min(float(y.min()) for _, y, _, _ in series)
+        y_max = max(float(y.max()) for _, y, _, _ in series)
+        if bars:
+            x_min -= 0.5
+            x_max += 0.5
+            y_min = min(y_min, 0.0)
+        y_margin = (y_max - y_min) * 0.05 or 1.0
+        y_min -= y_margin
+        y_max += y_margin
+        
+        x_scale = (right - left) / ((x_max - x_min) or 1.0)
+        y_scale = (bottom - top) / (y_max - y_min)
+        
+        # Grid and tick labels
+        grid_color = self._blend(colors[1], colors[2], 0.3)
+        y_format = "{:,.0f}" if y_max - y_min >= 10 else "{:.2f}"
+        for value in np.linspace(y_min + y_margin, y_max - y_margin, 5).tolist():
+            y = bottom - (value - y_min) * y_scale
+            draw.line([(left, y), (right, y)], fill=grid_color)
+            draw.text((left - 8, y), y_format.format(value), font=tick_font, fill=colors[1], anchor="rm")
+        x_ticks = np.linspace(x_min + (0.5 if bars else 0), x_max - (0.5 if bars else 0), 6)
+        for value in np.unique(x_ticks.round()).tolist():
+            x = left + (value - x_min) * x_scale
+            draw.line([(x, top), (x, bottom)], fill=grid_color)
+            draw.text((x, bottom + 8), f"{value:.0f}", font=tick_font, fill=colors[1], anchor="mt")
+        
+        # Data
+        for x_values, y_values, color, _ in series:
+            xs = left + (x_values - x_min) * x_scale
+            ys = bottom - (y_values - y_min) * y_scale
+            if bars:
+                half_width = 0.4 * x_scale
+                zero = bottom - (0 - y_min) * y_scale
+                for x, y in zip(xs.tolist(), ys.tolist()):
+                    draw.rectangle([(x - half_width, y), (x + half_width, zero)], fill=color)
+            else:
+                draw.line(list(zip(xs.tolist(), ys.tolist())), fill=color, width=3, joint="curve")
+        
+        # Axes
+        draw.rectangle([(left, top), (right, bottom)], outline=colors[1])
+        
+        # Legend
+        labels = [(color, label) for _, _, color, label in series if label]
+        for i, (color, label) in enumerate(labels):
+            y = top + 20 + i * 30
+            draw.line([(left + 20, y), (left + 60, y)], fill=color, width=3)
+            draw.text((left + 70, y), label, font=label_font, fill=colors[1], anchor="lm")
+        
+        # Title and axis labels
+        draw.text((width / 2, top / 2), title, font=title_font, fill=colors[1], anchor="mm")
+        draw.text(((left + right) / 2, height - 25), xlabel, font=label_font, fill=colors[1], anchor="mm")
+        
+        ylabel_box = label_font.getbbox(ylabel)
+        ylabel_image = Image.new('RGBA', (ylabel_box[2] + 4, ylabel_box[3] + 4), (0, 0, 0, 0))
+        ImageDraw.Draw(ylabel_image).text((2, 2), ylabel, font=label_font, fill=colors[1])
+        ylabel_image = ylabel_image.rotate(90, expand=True)
+        image.paste(ylabel_image, (10, (top + bottom - ylabel_image.height) // 2), ylabel_image)
+        
+        return image
+    
+    @staticmethod
+    def _blend(color: Tuple[int, int, int], background: Tuple[int, int, int],
+               alpha: float) -> Tuple[int, int, int]:
+        """
+        Blend a color over a background color.
+        
+        Args:
+            color: Foreground RGB color
+            background: Background RGB color
+            alpha: Opacity of the foreground color
+            
+        Returns:
+            tuple: Blended RGB color
+        """
+        return tuple(round(f * alpha + b * (1 - alpha)) for f, b in zip(color, background))
+    
+    def _chart_figure(self):
+        """
+        Get the shared matplotlib figure, creating it on first use.
+        
+        Callers must hold self._chart_lock, since matplotlib figures are not
+        thread-safe.
+        
+        Returns:
+            matplotlib.figure.Figure: The reusable chart figure
+        """
+        if self._chart_canvas is None:
+            _pyplot()
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            self._chart_canvas = FigureCanvasAgg(Figure(figsize=(12, 6.75), dpi=100))
+        return self._chart_canvas.figure
+    
+    def _create_matplotlib_chart(self, category: str, colors: List[str]) -> Image.Image:
+        """
+        Render a pie or polar chart with matplotlib.
+        
+        Args:
+            category: Topic category
+            colors: Theme colors
+            
+        Returns:
+            PIL.Image.Image: Generated chart image
+        """
+        with self._chart_lock:
+            fig = self._chart_figure()
+            fig.clear()
+            fig.set_facecolor(colors[2])
+            self._draw_matplotlib_chart(fig, category, colors)
+            
+            # Rasterize in place and copy the pixels out of the Agg buffer
+            canvas = self._chart_canvas
+            canvas.draw()
+            width, height = canvas.get_width_height()
+            return Image.frombuffer('RGBA', (width, height), canvas.buffer_rgba(),
+                                    'raw', 'RGBA', 0, 1).convert('RGB')
+    
+    @staticmethod
+    def _draw_matplotlib_chart(fig, category: str, colors: List[str]) -> None:
+        """
+        Draw a pie or polar chart onto a cleared figure.
+        
+        Args:
+            fig: Matplotlib figure to draw on
+            category: Topic category
+            colors: Theme colors
+        """
+        if category == "Privacy":
             # Privacy metrics
             labels = ['High', 'Medium', 'Low']
             sizes = [45, 30, 25]
-            plt.pie(sizes, labels=labels, colors=[colors[0], colors[3], colors[1]], 
+            ax = fig.add_subplot(111)
+            ax.pie(sizes, labels=labels, colors=[colors[0], colors[3], colors[1]], 
                    autopct='%1.1f%%', startangle=90)
-            plt.axis('equal')
-            plt.title("Privacy Levels in Cryptocurrency Users", fontsize=20, color=colors[1])
-            
+            ax.axis('equal')
+            ax.set_title("Privacy Levels in Cryptocurrency Users", fontsize=20, color=colors[1])
+        
         else:
             # Node setup difficulty
             categories = ['Hardware', 'Software', 'Maintenance', 'Security']
@@ -332,29 +755,23 @@ class ImageGenerator:
             angles += angles[:1]
             categories += categories[:1]
             
-            ax = plt.subplot(111, polar=True)
+            ax = fig.add_subplot(111, polar=True)
             ax.plot(angles, values, color=colors[0], linewidth=2)
             ax.fill(angles, values, color=colors[0], alpha=0.25)
             ax.set_thetagrids(np.degrees(angles[:-1]), categories[:-1])
-            plt.title("Node Setup Complexity", fontsize=24, color=colors[1])
+            ax.set_title("Node Setup Complexity", fontsize=24, color=colors[1])
         
         # Adjust style
-        plt.grid(alpha=0.3)
-        plt.tight_layout()
-        
-        # Save to BytesIO
-        buf = BytesIO()
-        plt.savefig(buf, format='png', dpi=100)
-        plt.close()
-        
-        # Convert to PIL Image
-        buf.seek(0)
-        return Image.open(buf)
+        ax.grid(alpha=0.3)
+        fig.tight_layout()
     
     def _add_text_overlay(self, image: Image.Image, text: str, category: str) -> Image.Image:
         """
         Add text overlay to an image.
         
+        An RGB image is drawn on in place and returned; callers must not
+        reuse it afterwards.
+        
         Args:
             image: Base image
             text: Text to overlay
@@ -365,11 +782,11 @@ class ImageGenerator:
         """
         # Get theme colors for the category
         theme = self.THEMES.get(category, self.THEMES["Bitcoin"])
-        colors = theme["colors"]
+        colors = theme["colors_rgb"]
         
-        # Create a copy of the image
-        result = image.copy()
-        draw = ImageDraw.Draw(result)
+        # Work on an RGB image; an RGBA draw blends translucent fills into it
+        result = image if image.mode == 'RGB' else image.convert('RGB')
+        result_draw = ImageDraw.Draw(result, 'RGBA')
         
         # Determine text size and position
         width, height = image.size
@@ -380,15 +797,8 @@ class ImageGenerator:
         
         # Try to use custom font, fall back to default
         try:
-            if self.font_bold:
-                title_font = ImageFont.truetype(self.font_bold, size=48)
-            else:
-                title_font = ImageFont.load_default()
-                
-            if self.font_regular:
-                body_font = ImageFont.truetype(self.font_regular, size=36)
-            else:
-                body_font = ImageFont.load_default()
+            title_font = self._font(self.font_bold, 48)
+            body_font = self._font(self.font_regular, 36)
         except Exception as e:
             logger.error(f"Error loading font: {str(e)}")
             title_font = ImageFont.load_default()
@@ -403,103 +813,151 @@ class ImageGenerator:
             title = text
             body = ""
         
-        # Add semi-transparent background for text
-        overlay = Image.new('RGBA', image.size, (0, 0, 0, 0))
-        overlay_draw = ImageDraw.Draw(overlay)
-        
         # Calculate text positions
         padding = 20
         text_box_height = height // 3
         text_box_y = height - text_box_height - padding
         
-        # Draw text background
-        overlay_draw.rectangle(
+        # Draw semi-transparent text background
+        result_draw.rectangle(
             [(padding, text_box_y), (width - padding, height - padding)],
             fill=(0, 0, 0, 180)
         )
         
-        # Composite the overlay onto the image
-        result = Image.alpha_composite(result.convert('RGBA'), overlay)
-        result_draw = ImageDraw.Draw(result)
-        
         # Draw title text
         title_y = text_box_y + padding
         result_draw.text((padding * 2, title_y), title, font=title_font, fill=colors[1])
         
         # Draw body text if available
         if body:
-            body_y = title_y + title_font.getsize(title)[1] + padding
+            body_y = title_y + title_font.getbbox(title)[3] + padding
             result_draw.text((padding * 2, body_y), body, font=body_font, fill=colors[1])
         
         # Add category label
-        label_padding = 10
-        label_height = 40
-        label_y = padding
-        label_width = title_font.getsize(category)[0] + label_padding * 4
+        label = self._label_chip(category, colors, title_font, body_font)
+        result.paste(label, (padding, padding), label)
         
-        # Draw label background
-        result_draw.rectangle(
-            [(padding, label_y), (padding + label_width, label_y + label_height)],
-            fill=colors[0]
-        )
+        return result
+    
+    def _label_chip(self, category: str, colors: List[Tuple[int, int, int]],
+                    title_font: ImageFont.ImageFont, body_font: ImageFont.ImageFont) -> Image.Image:
+        """
+        Get the rendered category label, drawing it only the first time.
         
-        # Draw label text
-        result_draw.text(
-            (padding + label_padding * 2, label_y + label_padding),
-            category,
-            font=body_font,
-            fill=colors[1]
-        )
+        Args:
+            category: Topic category
+            colors: Theme colors as RGB tuples
+            title_font: Font the label width is measured with
+            body_font: Font the label text is drawn with
+            
+        Returns:
+            PIL.Image.Image: RGBA label image, shared between calls
+        """
+        key = (category, title_font, body_font)
+        chip = self._label_chips.get(key)
+        if chip is None:
+            label_padding = 10
+            label_height = 40
+            label_width = int(title_font.getlength(category)) + label_padding * 4
+            chip = self._render_chip(category, body_font, (label_padding * 2, label_padding),
+                                     (label_width, label_height), colors[0], colors[1])
+            self._label_chips[key] = chip
+        return chip
+    
+    @staticmethod
+    def _render_chip(text: str, font: ImageFont.ImageFont, text_position: Tuple[int, int],
+                     box: Tuple[int, int], background: Tuple[int, int, int],
+                     foreground: Tuple[int, int, int]) -> Image.Image:
+        """
+        Render text over a solid box into an RGBA image for pasting.
+        
+        Pasting the result with itself as the mask gives the same pixels as
+        drawing the box and the text directly onto the target image.
         
-        return result.convert('RGB')
+        Args:
+            text: Text to draw
+            font: Font to draw the text with
+            text_position: Text origin, relative to the box's top left corner
+            box: Bottom right corner of the box (inclusive)
+            background: Box color
+            foreground: Text color
+            
+        Returns:
+            PIL.Image.Image: RGBA image covering the box and the text
+        """
+        # The text may extend past the box, so size the image to both
+        text_box = font.getbbox(text)
+        size = (max(box[0], text_position[0] + text_box[2]) + 1,
+                max(box[1], text_position[1] + text_box[3]) + 1)
+        
+        # Everything outside the box is text colored, so the alpha channel
+        # alone carries the glyph coverage there
+        chip = Image.new('RGB', size, foreground)
+        alpha = Image.new('L', size, 0)
+        ImageDraw.Draw(chip).rectangle([(0, 0), box], fill=background)
+        ImageDraw.Draw(alpha).rectangle([(0, 0), box], fill=255)
+        ImageDraw.Draw(chip).text(text_position, text, font=font, fill=foreground)
+        ImageDraw.Draw(alpha).text(text_position, text, font=font, fill=255)
+        chip.putalpha(alpha)
+        return chip
     
     def _add_branding(self, image: Image.Image) -> Image.Image:
         """
         Add branding elements to an image.
         
+        The image is drawn on in place and returned; callers must not reuse
+        it afterwards.
+        
         Args:
             image: Base image
             
         Returns:
             PIL.Image.Image: Image with branding
         """
-        # Create a copy of the image
-        result = image.copy()
-        draw = ImageDraw.Draw(result)
+        result = image
         
         # Get image dimensions
         width, height = image.size
         
         # Add watermark text
         try:
-            if self.font_regular:
-                watermark_font = ImageFont.truetype(self.font_regular, size=24)
-            else:
-                watermark_font = ImageFont.load_default()
-                
-            watermark_text = "AI Influencer"
-            text_width = watermark_font.getsize(watermark_text)[0]
+            watermark_font = self._font(self.font_regular, 24)
+            watermark, text_width = self._watermark_chip(watermark_font)
             
-            # Position in bottom right corner
+            # Position in bottom right corner, behind a padded background
+            text_bg_padding = 5
             text_x = width - text_width - 20
             text_y = height - 40
-            
-            # Draw semi-transparent background
-            text_bg_padding = 5
-            draw.rectangle(
-                [(text_x - text_bg_padding, text_y - text_bg_padding),
-                 (text_x + text_width + text_bg_padding, text_y + 30)],
-                fill=(0, 0, 0, 128)
-            )
-            
-            # Draw text
-            draw.text((text_x, text_y), watermark_text, font=watermark_font, fill=(255, 255, 255, 200))
-            
+            result.paste(watermark, (text_x - text_bg_padding, text_y - text_bg_padding), watermark)
+        
         except Exception as e:
             logger.error(f"Error adding branding: {str(e)}")
         
         return result
     
+    def _watermark_chip(self, font: ImageFont.ImageFont) -> Tuple[Image.Image, int]:
+        """
+        Get the rendered watermark, drawing it only the first time.
+        
+        Args:
+            font: Font the watermark is drawn with
+            
+        Returns:
+            tuple: (RGBA watermark image, width of the watermark text)
+        """
+        watermark = self._watermark_chips.get(font)
+        if watermark is None:
+            watermark_text = "AI Influencer"
+            text_width = int(font.getlength(watermark_text))
+            text_bg_padding = 5
+            
+            # Drawn onto RGB images, so the original translucent fills were opaque
+            chip = self._render_chip(watermark_text, font, (text_bg_padding, text_bg_padding),
+                                     (text_width + text_bg_padding * 2, 30 + text_bg_padding),
+                                     (0, 0, 0), (255, 255, 255))
+            watermark = self._watermark_chips[font] = (chip, text_width)
+        return watermark
+    
     def _resize_image(self, image: Image.Image, size_key: str = "twitter") -> Image.Image:
         """
         Resize image to standard dimensions.
@@ -512,6 +970,24 @@ class ImageGenerator:
             PIL.Image.Image: Resized image
         """
         target_size = self.IMAGE_SIZES.get(size_key, self.IMAGE_SIZES["twitter"])
+        return self._fit_image(image, target_size)
+    
+    @staticmethod
+    def _fit_image(image: Image.Image, target_size: Tuple[int, int]) -> Image.Image:
+        """
+        Crop an image to the target aspect ratio and resize it to the target size.
+        
+        Args:
+            image: Image to resize
+            target_size: Width and height to resize to
+            
+        Returns:
+            PIL.Image.Image: Resized image, or the image itself if it already
+                has the target size
+        """
+        # Images drawn at the target size need no resampling
+        if image.size == target_size:
+            return image
         
         # Calculate aspect ratios
         img_aspect = image.width / image.height
@@ -535,13 +1011,11 @@ class ImageGenerator:
             right = new_width
             bottom = top + new_height
         
-        # Crop and resize
-        image = image.crop((left, top, right, bottom))
-        image = image.resize(target_size, Image.LANCZOS)
-        
-        return image
+        # Crop and resize in a single pass
+        return image.resize(target_size, resample=Image.LANCZOS, box=(left, top, right, bottom))
     
-    def generate_image(self, text: str, category: str, size_key: str = "twitter") -> str:
+    def generate_image(self, text: str, category: str, size_key: str = "twitter",
+                       output_path: Optional[str] = None) -> str:
         """
         Generate an image based on text content and category.
         
@@ -549,23 +1023,33 @@ class ImageGenerator:
             text: Text content to base the image on
             category: Topic category
             size_key: Key for standard size ('twitter', 'square', or 'portrait')
-            
+            output_path: File to write the JPEG to (optional, defaults to a
+                temporary file)
+                
         Returns:
             str: Path to the generated image file
         """
         try:
+            # Procedural images are drawn at the target size straight away
+            target_size = self.IMAGE_SIZES.get(size_key, self.IMAGE_SIZES["twitter"])
+            
             # Determine image type based on category and content
             image_type = random.choice(["background", "chart"])
             
             if image_type == "chart" and category in ["Bitcoin", "Lightning Network", "Nostr", "Privacy", "Node Setup"]:
                 # Create chart image
-                base_image = self._create_chart_image(category)
+                base_image = self._create_chart_image(category, target_size)
             else:
                 # Get background image
-                base_image = self._get_background_image(category)
+                base_image = self._get_background_image(category, target_size)
             
             # Resize image to target dimensions
-            base_image = self._resize_image(base_image, size_key)
+            resized_image = self._resize_image(base_image, size_key)
+            
+            # The overlay steps draw in place, so never hand them a cached asset
+            if any(resized_image is cached for cached in self._image_cache.values()):
+                resized_image = resized_image.copy()
+            base_image = resized_image
             
             # Add text overlay
             image_with_text = self._add_text_overlay(base_image, text, category)
@@ -573,10 +1057,8 @@ class ImageGenerator:
             # Add branding
             final_image = self._add_branding(image_with_text)
             
-            # Save image to temporary file
-            with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as tmp:
-                final_image.save(tmp.name, format="JPEG", quality=95)
-                output_path = tmp.name
+            # Encode once, straight to the destination
+            output_path = self._save_jpeg(final_image, output_path)
             
             logger.info(f"Generated image saved to: {output_path}")
             return output_path
@@ -586,12 +1068,10 @@ class ImageGenerator:
             
             # Create a simple fallback image
             try:
-                fallback_image = self._generate_simple_background(category)
-                fallback_image = self._resize_image(fallback_image, size_key)
+                target_size = self.IMAGE_SIZES.get(size_key, self.IMAGE_SIZES["twitter"])
+                fallback_image = self._generate_simple_background(category, target_size)
                 
-                with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as tmp:
-                    fallback_image.save(tmp.name, format="JPEG", quality=90)
-                    output_path = tmp.name
+                output_path = self._save_jpeg(fallback_image, output_path)
                 
                 logger.info(f"Fallback image saved to: {output_path}")
                 return output_path
@@ -600,6 +1080,59 @@ class ImageGenerator:
                 logger.error(f"Error creating fallback image: {str(fallback_error)}")
                 return ""
     
+    def generate_images_batch(self, posts: List[Tuple[str, str]], size_key: str = "twitter",
+                              max_workers: Optional[int] = None) -> List[str]:
+        """
+        Generate images for several posts in parallel worker processes.
+        
+        Each worker builds its own ImageGenerator once, so fonts, asset caches
+        and the matplotlib figure are per process and reused across its posts.
+        
+        Args:
+            posts: List of (text, category) tuples
+            size_key: Key for standard size ('twitter', 'square', or 'portrait')
+            max_workers: Number of worker processes (defaults to the CPU count)
+            
+        Returns:
+            list: Paths to the generated image files, in the same order
+        """
+        jobs = [(text, category, size_key) for text, category in posts]
+        workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+        
+        # Starting a pool costs more than a single image
+        if workers <= 1:
+            return [self.generate_image(*job) for job in jobs]
+        
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                                 initargs=(self.assets_dir,)) as executor:
+            paths = list(executor.map(_generate_batch_image, jobs))
+        
+        logger.info(f"Generated {len(paths)} images with {workers} worker processes")
+        return paths
+    
+    def _save_jpeg(self, image: Image.Image, output_path: Optional[str] = None) -> str:
+        """
+        Encode an image as JPEG.
+        
+        Args:
+            image: Image to encode
+            output_path: Destination file (optional, defaults to a temporary file)
+            
+        Returns:
+            str: Path to the written file
+        """
+        if output_path:
+            output_dir = os.path.dirname(output_path)
+            if output_dir:
+                _ensure_dir(output_dir)
+            image.save(output_path, **self.JPEG_OPTIONS)
+            return output_path
+        
+        with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as tmp:
+            image.save(tmp, **self.JPEG_OPTIONS)
+            return tmp.name
+    
     def save_image_to_file(self, image_path: str, output_dir: str, filename: str) -> str:
         """
         Save a generated image to a specific file.
@@ -614,17 +1147,22 @@ class ImageGenerator:
         """
         try:
             # Create output directory if it doesn't exist
-            os.makedirs(output_dir, exist_ok=True)
-            
-            # Determine output path
-            output_path = os.path.join(output_dir, f"{filename}.jpg")
+            output_device = _ensure_dir(output_dir)
             
-            # Copy the image
-            image = Image.open(image_path)
-            image.save(output_path, format="JPEG", quality=95)
+            # Determine output path, keeping the already-encoded format
+            extension = os.path.splitext(image_path)[1] or ".jpg"
+            output_path = os.path.join(output_dir, f"{filename}{extension}")
             
-            # Remove temporary file
-            os.unlink(image_path)
+            # Move the temporary file into place
+            try:
+                _move_file(image_path, output_path, output_device)
+            except OSError as e:
+                if not isinstance(e, FileNotFoundError) and e.errno != errno.EXDEV:
+                    raise
+                # The directory was deleted or remounted since it was cached;
+                # recreate it and try once more
+                output_device = _ensure_dir(output_dir, refresh=True)
+                _move_file(image_path, output_path, output_device)
             
             logger.info(f"Image saved to: {output_path}")
             return output_path
@@ -8,17 +8,50 @@ This module provides test cases for the content generation module.
 """
 
 import os
+import asyncio
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 import json
 import tempfile
+from types import SimpleNamespace
+import openai
 from content_generator import ContentGenerator
 
+# Chat completion responses shared between tests, keyed by message text. They
+# are plain namespaces rather than mocks, so sharing them cannot leak calls.
+_RESPONSES = {}
+
+
+def _chat_response(text):
+    """Get a chat completion response carrying the given text, built once per text."""
+    response = _RESPONSES.get(text)
+    if response is None:
+        message = SimpleNamespace(content=text)
+        response = _RESPONSES[text] = SimpleNamespace(choices=[SimpleNamespace(message=message)])
+    return response
+
+
 class TestContentGenerator(unittest.TestCase):
     """Test cases for the ContentGenerator class."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Patch the OpenAI client class once for all tests."""
+        cls._openai_spec = openai.OpenAI
+        cls._openai_patch = patch('openai.OpenAI')
+        cls.mock_openai = cls._openai_patch.start()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Restore the OpenAI client class."""
+        cls._openai_patch.stop()
+    
     def setUp(self):
         """Set up test fixtures."""
+        # Forget calls and configuration left by the previous test
+        self.mock_openai.reset_mock(return_value=True, side_effect=True)
+        # Spec the client on the real class so a misspelled attribute fails loudly
+        self.mock_openai.return_value = MagicMock(spec_set=self._openai_spec)
         self.generator = ContentGenerator()
     
     def test_select_topic(self):
@@ -34,8 +67,16 @@ class TestContentGenerator(unittest.TestCase):
         
         # Test exclusion of topics
         excluded_topic = f"{category}: {specific_topic}"
-        new_category, new_specific_topic = self.generator.select_topic([excluded_topic])
+        excluded_topics = [excluded_topic]
+        new_category, new_specific_topic = self.generator.select_topic(excluded_topics)
         self.assertNotEqual(f"{new_category}: {new_specific_topic}", excluded_topic)
+        
+        # Test that the caller's exclusion list is left untouched
+        self.assertEqual(excluded_topics, [excluded_topic])
+        
+        # Test that the only topic left is selected when all others are excluded
+        all_topics = [f"{c}: {t}" for c, ts in self.generator.TOPIC_CATEGORIES.items() for t in ts]
+        self.assertEqual(self.generator.select_topic(all_topics[1:]), tuple(all_topics[0].split(": ", 1)))
     
     def test_generate_hashtags(self):
         """Test hashtag generation."""
@@ -47,21 +88,38 @@ class TestContentGenerator(unittest.TestCase):
         self.assertEqual(len(hashtags), 15)
         
         # Verify all hashtags start with #
-        for hashtag in hashtags:
-            self.assertTrue(hashtag.startswith('#'))
+        self.assertEqual([h for h in hashtags if not h.startswith('#')], [])
         
         # Test with invalid category
         invalid_hashtags = self.generator.generate_hashtags("InvalidCategory", count=5)
         self.assertEqual(len(invalid_hashtags), 5)
     
-    @patch('openai.ChatCompletion.create')
-    def test_generate_content_with_api(self, mock_create):
+    def test_generate_hashtags_seed(self):
+        """Test that seeded hashtag generation is reproducible."""
+        first = self.generator.generate_hashtags("Bitcoin", seed="bitcoin_bitcoin_basics")
+        second = self.generator.generate_hashtags("Bitcoin", seed="bitcoin_bitcoin_basics")
+        self.assertEqual(first, second)
+        
+        # Verify seeded generators select the same topics
+        topics = [ContentGenerator(seed=42).select_topic() for _ in range(2)]
+        self.assertEqual(topics[0], topics[1])
+    
+    def test_generate_hashtags_keeps_pools_intact(self):
+        """Test that hashtag generation does not grow the class hashtag pools."""
+        pool_sizes = {c: len(tags) for c, tags in self.generator.HASHTAGS.items()}
+        
+        # Request more hashtags than any single category provides
+        hashtags = self.generator.generate_hashtags("Nostr", count=40)
+        
+        # Verify the result
+        self.assertEqual(len(hashtags), 40)
+        self.assertEqual({c: len(tags) for c, tags in self.generator.HASHTAGS.items()}, pool_sizes)
+    
+    def test_generate_content_with_api(self):
         """Test content generation with OpenAI API."""
         # Set up mock response
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "This is a test tweet about Bitcoin basics."
-        mock_create.return_value = mock_response
+        mock_response = _chat_response("This is a test tweet about Bitcoin basics.")
+        self.mock_openai.return_value.chat.completions.create.return_value = mock_response
         
         # Set API key
         self.generator.set_api_key("test_api_key")
@@ -76,6 +134,54 @@ class TestContentGenerator(unittest.TestCase):
         self.assertEqual(content["topic"], "Bitcoin basics")
         self.assertEqual(len(content["hashtags"]), 15)
         self.assertIn(content["text"], content["full_text_with_hashtags"])
+        
+        # Verify the default model was requested
+        request = self.mock_openai.return_value.chat.completions.create.call_args.kwargs
+        self.assertEqual(request["model"], ContentGenerator.DEFAULT_MODEL)
+        
+        # Verify a per-call model override
+        self.generator.generate_content(category="Bitcoin", specific_topic="Bitcoin mining", model="gpt-4o")
+        request = self.mock_openai.return_value.chat.completions.create.call_args.kwargs
+        self.assertEqual(request["model"], "gpt-4o")
+    
+    def test_generate_content_uses_cache(self):
+        """Test that repeated requests for a topic reuse the generated text."""
+        # Set up mock response
+        mock_response = _chat_response("This is a cached tweet.")
+        mock_create = self.mock_openai.return_value.chat.completions.create
+        mock_create.return_value = mock_response
+        
+        # Set API key
+        self.generator.set_api_key("test_api_key")
+        
+        # Generate content twice for the same topic
+        first = self.generator.generate_content(category="Privacy", specific_topic="Privacy tools")
+        second = self.generator.generate_content(category="Privacy", specific_topic="Privacy tools")
+        
+        # Verify the API was only called once
+        mock_create.assert_called_once()
+        self.assertEqual(first["text"], second["text"])
+        self.assertEqual(len(second["hashtags"]), 15)
+    
+    def test_generate_content_retries_transient_errors(self):
+        """Test that rate limits and timeouts are retried with backoff."""
+        # Set up mock to time out once before succeeding
+        mock_response = _chat_response("This tweet survived a timeout.")
+        mock_create = self.mock_openai.return_value.chat.completions.create
+        mock_create.side_effect = [openai.APITimeoutError(request=MagicMock()), mock_response]
+        
+        # Set API key
+        self.generator.set_api_key("test_api_key")
+        
+        # Generate content without actually sleeping between attempts
+        with patch.object(ContentGenerator._call_openai.retry, 'sleep') as mock_sleep:
+            content = self.generator.generate_content(category="Bitcoin", specific_topic="Bitcoin halving")
+        
+        # Verify the result
+        self.assertTrue(content["success"])
+        self.assertEqual(content["text"], "This tweet survived a timeout.")
+        self.assertEqual(mock_create.call_count, 2)
+        mock_sleep.assert_called_once()
     
     def test_generate_content_without_api(self):
         """Test content generation without OpenAI API."""
@@ -90,11 +196,27 @@ class TestContentGenerator(unittest.TestCase):
         self.assertIn(content["text"], content["full_text_with_hashtags"])
         self.assertIn("Lightning Network nodes", content["text"])
     
-    @patch('openai.ChatCompletion.create')
-    def test_generate_content_api_error(self, mock_create):
+    def test_generate_batch_without_api(self):
+        """Test batch content generation without OpenAI API."""
+        # Generate a batch without API
+        results = self.generator.generate_batch_without_api(20)
+        
+        # Verify the result
+        self.assertEqual(len(results), 20)
+        for content in results:
+            self.assertTrue(content["success"])
+            self.assertIn(content["topic"], self.generator.TOPIC_CATEGORIES[content["category"]])
+            self.assertIn(content["topic"], content["text"])
+            self.assertEqual(len(content["hashtags"]), 15)
+            self.assertIn(content["text"], content["full_text_with_hashtags"])
+        
+        # Verify the topic history was not touched
+        self.assertEqual(len(self.generator.topic_history), 0)
+    
+    def test_generate_content_api_error(self):
         """Test content generation with API error."""
         # Set up mock to raise an exception
-        mock_create.side_effect = Exception("API Error")
+        self.mock_openai.return_value.chat.completions.create.side_effect = Exception("API Error")
         
         # Set API key
         self.generator.set_api_key("test_api_key")
@@ -108,14 +230,131 @@ class TestContentGenerator(unittest.TestCase):
         self.assertEqual(content["topic"], "Nostr relays")
         self.assertIn("API Error", content["error"])
     
+    def test_generate_batch(self):
+        """Test concurrent batch content generation."""
+        # Set up mock response
+        mock_response = _chat_response("This is a test tweet.")
+        
+        # Set API key; each batch creates its own async client
+        self.generator.set_api_key("test_api_key")
+        aclient = MagicMock(spec_set=openai.AsyncOpenAI)
+        aclient.chat.completions.create = AsyncMock(return_value=mock_response)
+        
+        # Generate two batches, each running in its own event loop
+        topics = [("Bitcoin", "Bitcoin basics"), ("Nostr", "Nostr relays")]
+        with patch('openai.AsyncOpenAI', return_value=aclient) as mock_async_openai:
+            results = self.generator.generate_batch(topics)
+            second = self.generator.generate_batch([("Privacy", "Privacy tools")])
+        
+        # Verify the result
+        self.assertEqual(len(results), 2)
+        self.assertEqual(aclient.chat.completions.create.await_count, 3)
+        for content, (category, topic) in zip(results, topics):
+            self.assertTrue(content["success"])
+            self.assertEqual(content["category"], category)
+            self.assertEqual(content["topic"], topic)
+            self.assertEqual(len(content["hashtags"]), 15)
+        self.assertTrue(second[0]["success"])
+        
+        # Verify a client was created and closed for every batch
+        self.assertEqual(mock_async_openai.call_count, 2)
+        self.assertEqual(aclient.close.await_count, 2)
+    
+    def test_generate_batch_concurrency(self):
+        """Test that batch generation limits the requests in flight."""
+        in_flight = []
+        peak = []
+        
+        async def mock_create(**kwargs):
+            in_flight.append(kwargs)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0)
+            in_flight.pop()
+            return _chat_response("This is a test tweet.")
+        
+        # Set up a generator allowing two concurrent requests
+        generator = ContentGenerator(api_key="test_api_key", concurrency=2, cache_size=0)
+        aclient = MagicMock(spec_set=openai.AsyncOpenAI)
+        aclient.chat.completions.create = mock_create
+        
+        # Generate two batches through the async API, each in its own event loop
+        topics = [("Bitcoin", topic) for topic in generator.TOPIC_CATEGORIES["Bitcoin"]]
+        with patch('openai.AsyncOpenAI', return_value=aclient) as mock_async_openai:
+            for _ in range(2):
+                peak.clear()
+                results = asyncio.run(generator.agenerate_batch(topics))
+                
+                # Verify the result
+                self.assertEqual(len(results), len(topics))
+                self.assertEqual(max(peak), 2)
+        
+        # Verify the semaphore and client lived exactly as long as each batch
+        self.assertEqual(mock_async_openai.call_count, 2)
+        self.assertEqual(aclient.close.await_count, 2)
+    
+    def test_astream_content(self):
+        """Test streaming content generation."""
+        # Set up mock stream
+        async def mock_stream():
+            for delta in ["Streaming ", None, "tweet."]:
+                chunk = MagicMock()
+                chunk.choices = [MagicMock()]
+                chunk.choices[0].delta.content = delta
+                yield chunk
+        
+        # Set API key and replace the async client
+        self.generator.set_api_key("test_api_key")
+        self.generator._aclient = MagicMock(spec_set=openai.AsyncOpenAI)
+        self.generator._aclient.chat.completions.create = AsyncMock(return_value=mock_stream())
+        
+        async def collect():
+            return [piece async for piece in self.generator.astream_content("Bitcoin", "Bitcoin basics")]
+        
+        pieces = asyncio.run(collect())
+        
+        # Verify the result
+        self.assertEqual(pieces[:2], ["Streaming ", "tweet."])
+        self.assertEqual(len(pieces[2].split()), 15)
+        self.assertTrue(self.generator._aclient.chat.completions.create.call_args.kwargs["stream"])
+    
+    def test_generate_content_batch_offline(self):
+        """Test content generation through the Batch API."""
+        # Set up mock client
+        output = "\n".join(json.dumps({
+            "custom_id": custom_id,
+            "response": {"status_code": 200, "body": {"choices": [{"message": {"content": text}}]}}
+        }) for custom_id, text in [("0_bitcoin_bitcoin_basics", "Batch tweet one."),
+                                   ("1_nostr_nostr_relays", "Batch tweet two.")])
+        mock_client = self.mock_openai.return_value
+        mock_client.files.create.return_value = MagicMock(id="file-in")
+        mock_client.batches.create.return_value = MagicMock(id="batch-1")
+        mock_client.batches.retrieve.return_value = MagicMock(status="completed", output_file_id="file-out")
+        mock_client.files.content.return_value = MagicMock(text=output)
+        
+        # Set API key
+        self.generator.set_api_key("test_api_key")
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_file = os.path.join(temp_dir, 'batch_state.json')
+            topics = [("Bitcoin", "Bitcoin basics"), ("Nostr", "Nostr relays")]
+            results = self.generator.generate_content_batch_offline(topics, state_file=state_file)
+            
+            # Verify the result
+            self.assertEqual([r["text"] for r in results], ["Batch tweet one.", "Batch tweet two."])
+            self.assertEqual([r["topic"] for r in results], ["Bitcoin basics", "Nostr relays"])
+            mock_client.batches.create.assert_called_once_with(
+                input_file_id="file-in",
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            self.assertFalse(os.path.exists(state_file))
+    
     def test_save_custom_prompt(self):
         """Test saving custom prompts."""
         with tempfile.TemporaryDirectory() as temp_dir:
-            # Patch the __file__ attribute to use the temp directory
-            original_dirname = os.path.dirname
-            try:
-                os.path.dirname = MagicMock(return_value=temp_dir)
-                
+            # Point the module directory at the temp directory
+            with patch('content_generator.os.path.dirname', return_value=temp_dir), \
+                 patch('content_generator.os.umask') as umask:
                 # Save a custom prompt
                 result = self.generator.save_custom_prompt(
                     category="Bitcoin", 
@@ -137,8 +376,32 @@ class TestContentGenerator(unittest.TestCase):
                 self.assertIn("bitcoin_bitcoin_security", prompts)
                 self.assertEqual(prompts["bitcoin_bitcoin_security"], "Write about Bitcoin security best practices.")
                 
-            finally:
-                os.path.dirname = original_dirname
+                # Verify the file keeps its permissions when rewritten
+                os.chmod(prompts_file, 0o644)
+                self.assertTrue(self.generator.save_custom_prompt("Nostr", "Nostr relays", "Write about relays."))
+                self.assertEqual(os.stat(prompts_file).st_mode & 0o777, 0o644)
+                
+                # Verify a failed swap leaves no temporary file behind
+                with patch('content_generator.os.replace', side_effect=OSError("disk full")):
+                    self.assertFalse(self.generator.save_custom_prompt("Privacy", "Privacy tools", "Write about privacy."))
+                self.assertEqual(os.listdir(temp_dir), ['custom_prompts.json'])
+                
+                # Verify the process-wide umask was never touched
+                umask.assert_not_called()
+    
+    def test_custom_prompts_reload_on_change(self):
+        """Test that custom prompts written by another process are picked up."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch('content_generator.os.path.dirname', return_value=temp_dir):
+                prompts_file = os.path.join(temp_dir, 'custom_prompts.json')
+                with open(prompts_file, 'w') as f:
+                    json.dump({"nostr_nostr_relays": "Write about relay diversity."}, f)
+                
+                # Build a request for the topic with a custom prompt
+                request = self.generator._build_request("Nostr", "Nostr relays", 280)
+                
+                # Verify the custom prompt was used
+                self.assertEqual(request["messages"][1]["content"], "Write about relay diversity.")
 
 
 if __name__ == '__main__':
@@ -10,31 +10,61 @@ This module provides test cases for the image generation module.
 import os
 import unittest
 from unittest.mock import patch, MagicMock
+import shutil
 import tempfile
 from PIL import Image
 from image_generator import ImageGenerator
 
+# matplotlib is only imported for the pie and polar charts; set USE_REAL_MPL
+# to exercise it instead of stubbing that step out
+USE_REAL_MPL = bool(os.environ.get('USE_REAL_MPL'))
+
+# Every chart category, and those drawn with matplotlib
+_CHART_CATEGORIES = ("Bitcoin", "Lightning Network", "Nostr", "Privacy", "Node Setup")
+_MPL_CHART_CATEGORIES = ("Privacy", "Node Setup")
+
+# JPEG start/end markers around a JFIF header, for tests that only move files
+_JPEG_STUB = b'\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00\xff\xd9'
+
 class TestImageGenerator(unittest.TestCase):
     """Test cases for the ImageGenerator class."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        # Create a temporary directory for assets
-        self.temp_dir = tempfile.TemporaryDirectory()
-        self.assets_dir = os.path.join(self.temp_dir.name, 'assets')
+    @staticmethod
+    def _create_assets_dir(root):
+        """Create an assets directory holding a single test background."""
+        assets_dir = os.path.join(root, 'assets')
         
         # Create subdirectories
-        os.makedirs(os.path.join(self.assets_dir, 'backgrounds'), exist_ok=True)
-        os.makedirs(os.path.join(self.assets_dir, 'icons'), exist_ok=True)
-        os.makedirs(os.path.join(self.assets_dir, 'fonts'), exist_ok=True)
+        os.makedirs(os.path.join(assets_dir, 'backgrounds'), exist_ok=True)
+        os.makedirs(os.path.join(assets_dir, 'icons'), exist_ok=True)
+        os.makedirs(os.path.join(assets_dir, 'fonts'), exist_ok=True)
         
         # Create a test background image
-        bg_dir = os.path.join(self.assets_dir, 'backgrounds')
+        bg_dir = os.path.join(assets_dir, 'backgrounds')
         test_bg = Image.new('RGB', (800, 600), color='blue')
         test_bg.save(os.path.join(bg_dir, 'bitcoin_test.jpg'))
+        return assets_dir
+    
+    @classmethod
+    def setUpClass(cls):
+        """Set up the assets and the generator shared by all tests."""
+        # The shared assets directory is only read; tests that change assets
+        # build their own with _create_assets_dir
+        cls.assets_temp_dir = tempfile.TemporaryDirectory()
+        cls.assets_dir = cls._create_assets_dir(cls.assets_temp_dir.name)
         
         # Initialize generator with test assets directory
-        self.generator = ImageGenerator(assets_dir=self.assets_dir)
+        cls.generator = ImageGenerator(assets_dir=cls.assets_dir)
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Tear down the shared assets."""
+        cls.assets_temp_dir.cleanup()
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        # Create a temporary directory for this test's output
+        self.temp_dir = tempfile.TemporaryDirectory()
     
     def tearDown(self):
         """Tear down test fixtures."""
@@ -49,6 +79,12 @@ class TestImageGenerator(unittest.TestCase):
         self.assertIsInstance(bg_image, Image.Image)
         self.assertEqual(bg_image.size, self.generator.IMAGE_SIZES["twitter"])
         self.assertEqual(bg_image.mode, 'RGB')
+        
+        # Backgrounds can be drawn straight at another target size
+        square_size = self.generator.IMAGE_SIZES["square"]
+        square = self.generator._generate_simple_background("Bitcoin", square_size)
+        self.assertEqual(square.size, square_size)
+        self.assertIs(self.generator._resize_image(square, "square"), square)
     
     def test_resize_image(self):
         """Test image resizing functionality."""
@@ -70,8 +106,8 @@ class TestImageGenerator(unittest.TestCase):
     
     def test_add_text_overlay(self):
         """Test adding text overlay to an image."""
-        # Create a test image
-        test_image = Image.new('RGB', (1200, 675), color='black')
+        # Create a small test image; the layout does not depend on the size
+        test_image = Image.new('RGB', (120, 67), color='black')
         
         # Add text overlay
         text = "This is a test message for Bitcoin enthusiasts."
@@ -79,37 +115,107 @@ class TestImageGenerator(unittest.TestCase):
         
         # Verify the result
         self.assertIsInstance(result, Image.Image)
-        self.assertEqual(result.size, (1200, 675))
+        self.assertEqual(result.size, (120, 67))
         self.assertEqual(result.mode, 'RGB')
+        
+        # The category label is rendered once and reused
+        chips = dict(self.generator._label_chips)
+        self.generator._add_text_overlay(test_image, "Another message.", "Bitcoin")
+        self.assertEqual(self.generator._label_chips, chips)
+    
+    def test_font_cache(self):
+        """Test that fonts are loaded once per path and size."""
+        font = self.generator._font(self.generator.font_regular, 24)
+        
+        # Verify the same font object is reused
+        self.assertIs(self.generator._font(self.generator.font_regular, 24), font)
+        self.assertIn((self.generator.font_regular, 24), self.generator._font_cache)
+    
+    def test_background_image_cache(self):
+        """Test that background images are decoded once."""
+        first = self.generator._get_background_image("Bitcoin")
+        second = self.generator._get_background_image("Bitcoin")
+        
+        # Verify the decoded image is reused
+        self.assertIs(first, second)
+        self.assertEqual(first.size, (800, 600))
+        
+        # Verify backgrounds requested at a size are cached resized
+        size = self.generator.IMAGE_SIZES["twitter"]
+        fitted = self.generator._get_background_image("Bitcoin", size)
+        self.assertEqual(fitted.size, size)
+        self.assertIs(self.generator._get_background_image("Bitcoin", size), fitted)
+        
+        # Verify the cache evicts the least recently used images to stay
+        # within its pixel budget
+        with patch.object(self.generator, 'IMAGE_CACHE_PIXELS', size[0] * size[1]):
+            self.generator._get_background_image("Bitcoin", (400, 300))
+        self.assertEqual([image.size for image in self.generator._image_cache.values()], [(400, 300)])
+        self.assertEqual(self.generator._image_cache_pixels, 400 * 300)
+        
+        # Verify refreshing the assets drops the cache
+        self.generator.refresh_assets()
+        self.assertIsNot(self.generator._get_background_image("Bitcoin"), first)
+    
+    def test_asset_index_extensions(self):
+        """Test that asset extensions are matched case-insensitively."""
+        assets_dir = self._create_assets_dir(self.temp_dir.name)
+        bg_dir = os.path.join(assets_dir, 'backgrounds')
+        Image.new('RGB', (800, 600), color='red').save(os.path.join(bg_dir, 'social_test.JPG'), format='JPEG')
+        with open(os.path.join(bg_dir, 'social_notes.txt'), 'w') as f:
+            f.write("not an image")
+        
+        generator = ImageGenerator(assets_dir=assets_dir)
+        self.assertEqual(generator._bg_index["Nostr"], [os.path.join(bg_dir, 'social_test.JPG')])
     
     def test_add_branding(self):
         """Test adding branding to an image."""
-        # Create a test image
-        test_image = Image.new('RGB', (1200, 675), color='black')
+        # Create a small test image; the layout does not depend on the size
+        test_image = Image.new('RGB', (120, 67), color='black')
         
         # Add branding
         result = self.generator._add_branding(test_image)
         
         # Verify the result
         self.assertIsInstance(result, Image.Image)
-        self.assertEqual(result.size, (1200, 675))
+        self.assertEqual(result.size, (120, 67))
+        
+        # The watermark is rendered once and reused
+        watermarks = dict(self.generator._watermark_chips)
+        self.assertEqual(len(watermarks), 1)
+        self.generator._add_branding(test_image)
+        self.assertEqual(self.generator._watermark_chips, watermarks)
     
-    @patch('matplotlib.pyplot.savefig')
-    def test_create_chart_image(self, mock_savefig):
+    def test_create_chart_image(self):
         """Test chart image creation."""
-        # Mock the savefig method to avoid actual file operations
-        mock_savefig.side_effect = lambda buf, format, dpi: None
-        
-        # Create a BytesIO object that returns a valid image when opened
-        with patch('PIL.Image.open') as mock_open:
-            mock_image = MagicMock()
-            mock_image.size = (1200, 675)
-            mock_open.return_value = mock_image
-            
-            # Test chart creation for each category
-            for category in ["Bitcoin", "Lightning Network", "Nostr", "Privacy", "Node Setup"]:
+        # Stand in for the matplotlib step so the test does not import it
+        chart = Image.new('RGB', self.generator.IMAGE_SIZES["twitter"])
+        with patch.object(self.generator, '_create_matplotlib_chart', return_value=chart) as mock_mpl:
+            # Every category is rendered in memory, without a PNG round-trip
+            for category in _CHART_CATEGORIES:
+                with self.subTest(category=category):
+                    result = self.generator._create_chart_image(category)
+                    self.assertIsInstance(result, Image.Image)
+                    self.assertEqual(result.size, self.generator.IMAGE_SIZES["twitter"])
+                    self.assertEqual(result.mode, 'RGB')
+        
+        # Only the pie and polar charts go through matplotlib
+        self.assertEqual(tuple(c.args[0] for c in mock_mpl.call_args_list), _MPL_CHART_CATEGORIES)
+    
+    @unittest.skipUnless(USE_REAL_MPL, "set USE_REAL_MPL=1 to render charts with matplotlib")
+    def test_create_matplotlib_chart(self):
+        """Test the pie and polar charts rendered with matplotlib."""
+        for category in _MPL_CHART_CATEGORIES:
+            with self.subTest(category=category):
                 result = self.generator._create_chart_image(category)
-                self.assertEqual(result, mock_image)
+                self.assertIsInstance(result, Image.Image)
+                self.assertEqual(result.size, self.generator.IMAGE_SIZES["twitter"])
+                self.assertEqual(result.mode, 'RGB')
+        
+        # The matplotlib charts share a single figure
+        canvas = self.generator._chart_canvas
+        self.generator._create_chart_image("Privacy")
+        self.assertIs(self.generator._chart_canvas, canvas)
     
     def test_generate_image(self):
         """Test the main image generation method."""
@@ -119,11 +225,11 @@ class TestImageGenerator(unittest.TestCase):
              patch.object(self.generator, '_add_text_overlay') as mock_text, \
              patch.object(self.generator, '_add_branding') as mock_brand:
             
-            # Set up mocks
-            mock_bg.return_value = Image.new('RGB', (800, 600), color='blue')
-            mock_resize.return_value = Image.new('RGB', (1200, 675), color='blue')
-            mock_text.return_value = Image.new('RGB', (1200, 675), color='blue')
-            mock_brand.return_value = Image.new('RGB', (1200, 675), color='blue')
+            # Set up mocks; no pixel data is needed, so no real images either
+            mock_bg.return_value = MagicMock(spec=Image.Image, size=(800, 600), mode='RGB')
+            mock_resize.return_value = MagicMock(spec=Image.Image, size=(1200, 675), mode='RGB')
+            mock_text.return_value = MagicMock(spec=Image.Image, size=(1200, 675), mode='RGB')
+            mock_brand.return_value = MagicMock(spec=Image.Image, size=(1200, 675), mode='RGB')
             
             # Generate image
             text = "Test message about Bitcoin"
@@ -132,17 +238,76 @@ class TestImageGenerator(unittest.TestCase):
             # Verify the result
             self.assertTrue(os.path.exists(result_path))
             self.assertTrue(result_path.endswith('.jpg'))
+            mock_brand.return_value.save.assert_called_once()
             
             # Clean up
             if os.path.exists(result_path):
                 os.unlink(result_path)
     
+    def test_generate_image_keeps_cached_asset(self):
+        """Test that drawing in place never touches a cached background."""
+        assets_dir = self._create_assets_dir(self.temp_dir.name)
+        bg_path = os.path.join(assets_dir, 'backgrounds', 'bitcoin_test.jpg')
+        generator = ImageGenerator(assets_dir=assets_dir)
+        Image.new('RGB', generator.IMAGE_SIZES["twitter"], color='blue').save(bg_path)
+        
+        # Always pick the background path and the first background file
+        output_path = os.path.join(self.temp_dir.name, 'tweet.jpg')
+        with patch('image_generator.random.choice', side_effect=lambda seq: seq[0]):
+            generator.generate_image("Test message about Bitcoin", "Bitcoin", output_path=output_path)
+        
+        cached = generator._load_image(bg_path)
+        self.assertEqual(cached.getextrema(), Image.open(bg_path).getextrema())
+    
+    def test_generate_image_output_path(self):
+        """Test generating an image directly into a requested file."""
+        output_path = os.path.join(self.temp_dir.name, 'output', 'tweet.jpg')
+        
+        with patch.object(self.generator, '_add_text_overlay', side_effect=lambda image, text, category: image):
+            result_path = self.generator.generate_image("Test message about Bitcoin", "Bitcoin",
+                                                        output_path=output_path)
+        
+        # Verify the image was encoded once, at the requested location
+        self.assertEqual(result_path, output_path)
+        with Image.open(output_path) as saved:
+            self.assertEqual(saved.format, 'JPEG')
+            self.assertEqual(saved.size, self.generator.IMAGE_SIZES["twitter"])
+    
+    def test_generate_images_batch(self):
+        """Test generating images for several posts in worker processes."""
+        posts = [("First test message.", "Bitcoin"), ("Second test message.", "Nostr")]
+        paths = self.generator.generate_images_batch(posts, max_workers=2)
+        
+        self.assertEqual(len(paths), 2)
+        for path in paths:
+            self.assertTrue(os.path.exists(path))
+            with Image.open(path) as image:
+                self.assertEqual(image.size, self.generator.IMAGE_SIZES["twitter"])
+            os.unlink(path)
+    
+    def test_download_streams_to_file(self):
+        """Test that downloads stream through the shared session."""
+        import io
+        response = MagicMock()
+        response.raw = io.BytesIO(b"font data")
+        response.__enter__.return_value = response
+        session = MagicMock()
+        session.get.return_value = response
+        
+        font_path = os.path.join(self.temp_dir.name, 'font.ttf')
+        with patch.object(ImageGenerator, '_http', session):
+            self.generator._download("https://example.com/font.ttf", font_path)
+        
+        session.get.assert_called_once_with("https://example.com/font.ttf", stream=True, timeout=30)
+        with open(font_path, 'rb') as f:
+            self.assertEqual(f.read(), b"font data")
+        self.assertFalse(os.path.exists(font_path + '.part'))
+    
     def test_save_image_to_file(self):
         """Test saving an image to a specific file."""
-        # Create a temporary image file
+        # Create a temporary image file; the bytes are moved, never decoded
         with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp:
-            test_image = Image.new('RGB', (100, 100), color='red')
-            test_image.save(tmp.name)
+            tmp.write(_JPEG_STUB)
             temp_path = tmp.name
         
         # Save to a specific location
@@ -153,6 +318,19 @@ class TestImageGenerator(unittest.TestCase):
         self.assertTrue(os.path.exists(result_path))
         self.assertTrue(result_path.endswith('test_image.jpg'))
         self.assertEqual(os.path.dirname(result_path), output_dir)
+        self.assertFalse(os.path.exists(temp_path))
+        with open(result_path, 'rb') as f:
+            self.assertEqual(f.read(), _JPEG_STUB)
+        
+        # Verify saving still works after the output directory was deleted
+        shutil.rmtree(output_dir)
+        with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp:
+            tmp.write(_JPEG_STUB)
+            temp_path = tmp.name
+        result_path = self.generator.save_image_to_file(temp_path, output_dir, "test_image")
+        self.assertEqual(result_path, os.path.join(output_dir, 'test_image.jpg'))
+        self.assertTrue(os.path.exists(result_path))
+        self.assertFalse(os.path.exists(temp_path))
         
         # Clean up
         if os.path.exists(result_path):
@@ -12,29 +12,54 @@ import unittest
 from unittest.mock import patch, MagicMock
 import json
 import tempfile
+import datetime
+from types import MappingProxyType, SimpleNamespace
+import tweepy
 from twitter_api import TwitterAPI
 
 class TestTwitterAPI(unittest.TestCase):
     """Test cases for the TwitterAPI class."""
     
+    # Read-only, so no test can change the credentials the others see
+    test_credentials = MappingProxyType({
+        'api_key': 'test_api_key',
+        'api_secret': 'test_api_secret',
+        'access_token': 'test_access_token',
+        'access_token_secret': 'test_access_token_secret'
+    })
+    
+    @classmethod
+    def setUpClass(cls):
+        """Patch the Tweepy classes and write the credentials file once for all tests."""
+        cls._specs = (tweepy.OAuth1UserHandler, tweepy.API, tweepy.Client)
+        cls._patches = [patch('tweepy.OAuth1UserHandler'), patch('tweepy.API'), patch('tweepy.Client')]
+        cls.mock_auth, cls.mock_api, cls.mock_client = [p.start() for p in cls._patches]
+        
+        # The credentials file is only ever read, so every test can share it
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.credentials_file = os.path.join(cls.temp_dir.name, 'credentials.json')
+        with open(cls.credentials_file, 'w') as f:
+            json.dump(dict(cls.test_credentials), f)
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Restore the Tweepy classes and remove the credentials file."""
+        for p in cls._patches:
+            p.stop()
+        cls.temp_dir.cleanup()
+    
     def setUp(self):
         """Set up test fixtures."""
-        self.test_credentials = {
-            'api_key': 'test_api_key',
-            'api_secret': 'test_api_secret',
-            'access_token': 'test_access_token',
-            'access_token_secret': 'test_access_token_secret'
-        }
-        
-        # Create a temporary credentials file
-        self.temp_dir = tempfile.TemporaryDirectory()
-        self.credentials_file = os.path.join(self.temp_dir.name, 'credentials.json')
-        with open(self.credentials_file, 'w') as f:
-            json.dump(self.test_credentials, f)
-    
-    def tearDown(self):
-        """Tear down test fixtures."""
-        self.temp_dir.cleanup()
+        # Forget calls and configuration left by the previous test
+        for mock in (self.mock_auth, self.mock_api, self.mock_client):
+            mock.reset_mock(return_value=True, side_effect=True)
+        
+        # Make every test authenticate from scratch
+        TwitterAPI._clients.clear()
+        
+        # Spec the instances on the real classes so a misspelled Tweepy method fails loudly
+        for mock, spec in zip((self.mock_auth, self.mock_api, self.mock_client), self._specs):
+            mock.return_value = MagicMock(spec_set=spec)
     
     def test_load_credentials_from_file(self):
         """Test loading credentials from a file."""
@@ -71,6 +96,11 @@ class TestTwitterAPI(unittest.TestCase):
         self.assertEqual(twitter.api_secret, 'manual_api_secret')
         self.assertEqual(twitter.access_token, 'manual_access_token')
         self.assertEqual(twitter.access_token_secret, 'manual_access_token_secret')
+        
+        # Test that authentication is not attempted with a credential missing
+        twitter.set_credentials('manual_api_key', 'manual_api_secret', 'manual_access_token', '')
+        self.assertFalse(twitter.authenticate())
+        self.mock_auth.assert_not_called()
     
     def test_save_credentials(self):
         """Test saving credentials to a file."""
@@ -96,21 +126,8 @@ class TestTwitterAPI(unittest.TestCase):
         self.assertEqual(saved_credentials['access_token'], 'save_access_token')
         self.assertEqual(saved_credentials['access_token_secret'], 'save_access_token_secret')
     
-    @patch('tweepy.OAuth1UserHandler')
-    @patch('tweepy.API')
-    @patch('tweepy.Client')
-    def test_authenticate_success(self, mock_client, mock_api, mock_auth):
+    def test_authenticate_success(self):
         """Test successful authentication."""
-        # Set up mocks
-        mock_auth_instance = MagicMock()
-        mock_auth.return_value = mock_auth_instance
-        
-        mock_api_instance = MagicMock()
-        mock_api.return_value = mock_api_instance
-        
-        mock_client_instance = MagicMock()
-        mock_client.return_value = mock_client_instance
-        
         # Create TwitterAPI instance and authenticate
         twitter = TwitterAPI(credentials_file=self.credentials_file)
         result = twitter.authenticate()
@@ -118,26 +135,47 @@ class TestTwitterAPI(unittest.TestCase):
         # Assertions
         self.assertTrue(result)
         self.assertTrue(twitter.authenticated)
-        mock_auth.assert_called_once_with(
+        self.mock_auth.assert_called_once_with(
             self.test_credentials['api_key'],
             self.test_credentials['api_secret'],
             self.test_credentials['access_token'],
             self.test_credentials['access_token_secret']
         )
-        mock_api.assert_called_once_with(mock_auth_instance)
-        mock_client.assert_called_once()
+        self.mock_api.assert_called_once_with(self.mock_auth.return_value)
+        self.mock_client.assert_called_once()
     
-    @patch('tweepy.OAuth1UserHandler')
-    @patch('tweepy.API')
-    def test_authenticate_failure(self, mock_api, mock_auth):
+    def test_authenticate_reuses_clients(self):
+        """Test that instances with the same credentials share verified clients."""
+        first = TwitterAPI(credentials_file=self.credentials_file)
+        second = TwitterAPI(credentials_file=self.credentials_file)
+        self.assertTrue(first.authenticate())
+        self.assertTrue(second.authenticate())
+        
+        # Assertions
+        self.mock_auth.assert_called_once()
+        self.mock_api.return_value.verify_credentials.assert_called_once()
+        self.assertIs(second.api, first.api)
+        self.assertIs(second.client, first.client)
+        
+        # Test that different credentials are verified separately
+        third = TwitterAPI()
+        third.set_credentials('other_api_key', 'other_api_secret', 'other_access_token', 'other_access_token_secret')
+        self.assertTrue(third.authenticate())
+        self.assertEqual(self.mock_auth.call_count, 2)
+        
+        # Test that clients rejected as unauthorized are verified again
+        response = MagicMock(status_code=401, reason='Unauthorized')
+        response.json.return_value = {}
+        self.mock_client.return_value.create_tweet.side_effect = tweepy.Unauthorized(response)
+        self.assertIsNone(first.post_tweet("Test tweet"))
+        self.assertFalse(first.authenticated)
+        self.assertTrue(TwitterAPI(credentials_file=self.credentials_file).authenticate())
+        self.assertEqual(self.mock_api.return_value.verify_credentials.call_count, 3)
+    
+    def test_authenticate_failure(self):
         """Test authentication failure."""
         # Set up mocks
-        mock_auth_instance = MagicMock()
-        mock_auth.return_value = mock_auth_instance
-        
-        mock_api_instance = MagicMock()
-        mock_api_instance.verify_credentials.side_effect = Exception("Authentication failed")
-        mock_api.return_value = mock_api_instance
+        self.mock_api.return_value.verify_credentials.side_effect = tweepy.TweepyException("Authentication failed")
         
         # Create TwitterAPI instance and authenticate
         twitter = TwitterAPI(credentials_file=self.credentials_file)
@@ -147,72 +185,64 @@ class TestTwitterAPI(unittest.TestCase):
         self.assertFalse(result)
         self.assertFalse(twitter.authenticated)
     
-    @patch('tweepy.OAuth1UserHandler')
-    @patch('tweepy.API')
-    @patch('tweepy.Client')
-    def test_post_tweet_text_only(self, mock_client, mock_api, mock_auth):
-        """Test posting a tweet with text only."""
+    def test_post_tweet(self):
+        """Test posting a tweet with text only and with an image."""
         # Set up mocks
-        mock_auth_instance = MagicMock()
-        mock_auth.return_value = mock_auth_instance
+        mock_media = MagicMock()
+        mock_media.media_id = '67890'
         
-        mock_api_instance = MagicMock()
-        mock_api.return_value = mock_api_instance
+        mock_api_instance = self.mock_api.return_value
+        mock_api_instance.media_upload.return_value = mock_media
         
-        mock_client_instance = MagicMock()
+        mock_client_instance = self.mock_client.return_value
         mock_client_instance.create_tweet.return_value = MagicMock(data={'id': '12345'})
-        mock_client.return_value = mock_client_instance
         
-        # Create TwitterAPI instance and post tweet
+        # Create TwitterAPI instance and authenticate once for both scenarios
         twitter = TwitterAPI(credentials_file=self.credentials_file)
         twitter.authenticate()
-        tweet_id = twitter.post_tweet("Test tweet")
         
-        # Assertions
-        self.assertEqual(tweet_id, '12345')
-        mock_client_instance.create_tweet.assert_called_once_with(text="Test tweet")
+        scenarios = [
+            ("Test tweet", None, {}),
+            ("Test tweet with image", "test_image.jpg", {"media_ids": ['67890']}),
+        ]
+        for text, image_path, media_kwargs in scenarios:
+            with self.subTest(image_path=image_path):
+                mock_api_instance.media_upload.reset_mock()
+                mock_client_instance.create_tweet.reset_mock()
+                
+                tweet_id = twitter.post_tweet(text, image_path=image_path)
+                
+                # Assertions
+                self.assertEqual(tweet_id, '12345')
+                if image_path:
+                    mock_api_instance.media_upload.assert_called_once_with(image_path)
+                else:
+                    mock_api_instance.media_upload.assert_not_called()
+                mock_client_instance.create_tweet.assert_called_once_with(text=text, **media_kwargs)
+        
+        # A missing image fails the post instead of dropping the image
+        mock_client_instance.create_tweet.reset_mock()
+        mock_api_instance.media_upload.side_effect = FileNotFoundError("missing.jpg")
+        self.assertIsNone(twitter.post_tweet("Test tweet with image", image_path="missing.jpg"))
+        mock_client_instance.create_tweet.assert_not_called()
     
-    @patch('tweepy.OAuth1UserHandler')
-    @patch('tweepy.API')
-    @patch('tweepy.Client')
-    @patch('os.path.exists')
-    def test_post_tweet_with_image(self, mock_exists, mock_client, mock_api, mock_auth):
-        """Test posting a tweet with an image."""
+    def test_requires_authentication(self):
+        """Test that API calls fail cleanly when authentication fails."""
         # Set up mocks
-        mock_auth_instance = MagicMock()
-        mock_auth.return_value = mock_auth_instance
-        
-        mock_media = MagicMock()
-        mock_media.media_id = '67890'
+        self.mock_api.return_value.verify_credentials.side_effect = tweepy.TweepyException("Authentication failed")
         
-        mock_api_instance = MagicMock()
-        mock_api_instance.media_upload.return_value = mock_media
-        mock_api.return_value = mock_api_instance
-        
-        mock_client_instance = MagicMock()
-        mock_client_instance.create_tweet.return_value = MagicMock(data={'id': '12345'})
-        mock_client.return_value = mock_client_instance
-        
-        mock_exists.return_value = True
-        
-        # Create TwitterAPI instance and post tweet with image
         twitter = TwitterAPI(credentials_file=self.credentials_file)
-        twitter.authenticate()
-        tweet_id = twitter.post_tweet("Test tweet with image", image_path="test_image.jpg")
         
         # Assertions
-        self.assertEqual(tweet_id, '12345')
-        mock_api_instance.media_upload.assert_called_once_with("test_image.jpg")
-        mock_client_instance.create_tweet.assert_called_once_with(text="Test tweet with image", media_ids=['67890'])
+        self.assertIsNone(twitter.post_tweet("Test tweet"))
+        self.assertFalse(twitter.delete_tweet("12345"))
+        self.mock_client.return_value.create_tweet.assert_not_called()
+        self.mock_client.return_value.delete_tweet.assert_not_called()
+        self.assertEqual(TwitterAPI.post_tweet.__name__, 'post_tweet')
     
-    @patch('tweepy.OAuth1UserHandler')
-    @patch('tweepy.API')
-    def test_get_user_info(self, mock_api, mock_auth):
+    def test_get_user_info(self):
         """Test getting user information."""
         # Set up mocks
-        mock_auth_instance = MagicMock()
-        mock_auth.return_value = mock_auth_instance
-        
         mock_user = MagicMock()
         mock_user.id = 123456
         mock_user.screen_name = 'test_user'
@@ -223,9 +253,7 @@ class TestTwitterAPI(unittest.TestCase):
         mock_user.statuses_count = 200
         mock_user.profile_image_url_https = 'https://example.com/image.jpg'
         
-        mock_api_instance = MagicMock()
-        mock_api_instance.verify_credentials.return_value = mock_user
-        mock_api.return_value = mock_api_instance
+        self.mock_api.return_value.verify_credentials.return_value = mock_user
         
         # Create TwitterAPI instance and get user info
         twitter = TwitterAPI(credentials_file=self.credentials_file)
@@ -242,6 +270,41 @@ class TestTwitterAPI(unittest.TestCase):
         self.assertEqual(user_info['statuses_count'], 200)
         self.assertEqual(user_info['profile_image_url'], 'https://example.com/image.jpg')
 
+    
+    def test_get_tweets(self):
+        """Test getting the user timeline and searching tweets."""
+        # Set up mocks
+        created_at = datetime.datetime(2024, 1, 1, 12, 0)
+        user = SimpleNamespace(id=1, screen_name='test_user', name='Test User')
+        tweets = [
+            SimpleNamespace(id=10, text='With media', created_at=created_at, retweet_count=2,
+                            favorite_count=3, entities={'media': []}, user=user),
+            SimpleNamespace(id=11, text='Without entities', created_at=created_at, retweet_count=0,
+                            favorite_count=1, user=user),
+        ]
+        self.mock_api.return_value.user_timeline.return_value = tweets
+        self.mock_api.return_value.search_tweets.return_value = tweets
+        
+        twitter = TwitterAPI(credentials_file=self.credentials_file)
+        twitter.authenticate()
+        
+        # Assertions
+        timeline = twitter.get_user_tweets(count=2)
+        self.assertEqual([t['has_media'] for t in timeline], [True, False])
+        self.assertEqual(timeline[0], {
+            'id': 10,
+            'text': 'With media',
+            'created_at': created_at.isoformat(),
+            'retweet_count': 2,
+            'favorite_count': 3,
+            'has_media': True
+        })
+        
+        results = twitter.search_tweets("bitcoin", count=2)
+        self.assertEqual([t['id'] for t in results], [10, 11])
+        self.assertEqual(results[1]['user'], {'id': 1, 'screen_name': 'test_user', 'name': 'Test User'})
+        self.mock_api.return_value.search_tweets.assert_called_once_with(q="bitcoin", count=2)
+
 
 if __name__ == '__main__':
     unittest.main()
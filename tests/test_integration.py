@@ -13,6 +13,7 @@ import unittest
 from unittest.mock import patch, MagicMock
 import tempfile
 import json
+from types import MappingProxyType
 
 # Add parent directory to path to import modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -20,44 +21,91 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from twitter_api import TwitterAPI
 from content_generator import ContentGenerator
 from image_generator import ImageGenerator
+from PyQt5.QtCore import QSettings
+from PyQt5.QtWidgets import QApplication
 from gui import AIInfluencerGUI, PostingWorker, ScheduleWorker
 
+# Canned content generator results; read-only so no test can alter them for the next
+_CONTENT = MappingProxyType({
+    "success": True,
+    "text": "Test tweet about Bitcoin",
+    "hashtags": ("#Bitcoin", "#Crypto", "#BTC"),
+    "category": "Bitcoin",
+    "topic": "Bitcoin basics",
+    "full_text_with_hashtags": "Test tweet about Bitcoin\n\n#Bitcoin #Crypto #BTC"
+})
+_FALLBACK_CONTENT = MappingProxyType({
+    "success": True,
+    "text": "Fallback tweet about Bitcoin",
+    "hashtags": ("#Bitcoin", "#Crypto", "#BTC"),
+    "category": "Bitcoin",
+    "topic": "Bitcoin basics",
+    "full_text_with_hashtags": "Fallback tweet about Bitcoin\n\n#Bitcoin #Crypto #BTC"
+})
+_CONTENT_ERROR = MappingProxyType({
+    "success": False,
+    "error": "API error",
+    "category": "Bitcoin",
+    "topic": "Bitcoin basics"
+})
+
 class TestIntegration(unittest.TestCase):
     """Integration tests for the AI Influencer system."""
     
-    def setUp(self):
-        """Set up test fixtures."""
+    @classmethod
+    def setUpClass(cls):
+        """Create the test data shared by all tests."""
         # Create temporary directory for test data
-        self.temp_dir = tempfile.TemporaryDirectory()
-        self.data_dir = self.temp_dir.name
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.data_dir = cls.temp_dir.name
         
-        # Create mock components
-        self.twitter_api = MagicMock(spec=TwitterAPI)
-        self.content_generator = MagicMock(spec=ContentGenerator)
-        self.image_generator = MagicMock(spec=ImageGenerator)
+        # Create test image file; the mocked workers only pass its path around
+        cls.image_path = os.path.join(cls.data_dir, "test_image.jpg")
+        with open(cls.image_path, "w") as f:
+            f.write("test image content")
+        
+        # Create mock components; spec'ing them is the costly part, so build them once
+        cls.twitter_api = MagicMock(spec=TwitterAPI)
+        cls.content_generator = MagicMock(spec=ContentGenerator)
+        cls.image_generator = MagicMock(spec=ImageGenerator)
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared test data."""
+        cls.temp_dir.cleanup()
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        # Forget calls and configuration left by the previous test
+        for mock in (self.twitter_api, self.content_generator, self.image_generator):
+            mock.reset_mock(return_value=True, side_effect=True)
         
         # Set up mock returns
         self.twitter_api.authenticate.return_value = True
         self.twitter_api.post_tweet.return_value = "12345"
         
-        self.content_generator.generate_content.return_value = {
-            "success": True,
-            "text": "Test tweet about Bitcoin",
-            "hashtags": ["#Bitcoin", "#Crypto", "#BTC"],
-            "category": "Bitcoin",
-            "topic": "Bitcoin basics",
-            "full_text_with_hashtags": "Test tweet about Bitcoin\n\n#Bitcoin #Crypto #BTC"
-        }
-        
-        self.image_generator.generate_image.return_value = os.path.join(self.data_dir, "test_image.jpg")
+        self.content_generator.generate_content.return_value = _CONTENT
         
-        # Create test image file
-        with open(os.path.join(self.data_dir, "test_image.jpg"), "w") as f:
-            f.write("test image content")
+        self.image_generator.generate_image.return_value = self.image_path
     
-    def tearDown(self):
-        """Tear down test fixtures."""
-        self.temp_dir.cleanup()
+    @staticmethod
+    def _connect_mock_slots(worker):
+        """
+        Connect mock slots to a posting worker's signals.
+        
+        Bound Qt signals cannot be replaced by mocks, so the emitted values are
+        observed through connected slots instead.
+        
+        Args:
+            worker: PostingWorker to observe
+            
+        Returns:
+            tuple: Mock slots for status_update, post_complete and post_error
+        """
+        slots = (MagicMock(), MagicMock(), MagicMock())
+        for signal, slot in zip((worker.status_update, worker.post_complete, worker.post_error), slots):
+            signal.connect(slot)
+        return slots
     
     def test_posting_worker(self):
         """Test the posting worker integration."""
@@ -68,10 +116,8 @@ class TestIntegration(unittest.TestCase):
             self.image_generator
         )
         
-        # Mock signals
-        worker.status_update = MagicMock()
-        worker.post_complete = MagicMock()
-        worker.post_error = MagicMock()
+        # Connect mock slots
+        status_update, post_complete, post_error = self._connect_mock_slots(worker)
         
         # Run the worker
         worker.run()
@@ -84,33 +130,21 @@ class TestIntegration(unittest.TestCase):
         )
         self.twitter_api.post_tweet.assert_called_once_with(
             "Test tweet about Bitcoin\n\n#Bitcoin #Crypto #BTC",
-            os.path.join(self.data_dir, "test_image.jpg")
+            self.image_path
         )
         
         # Verify signals
-        worker.status_update.assert_called()
-        worker.post_complete.assert_called_once()
-        worker.post_error.assert_not_called()
+        status_update.assert_called()
+        post_complete.assert_called_once()
+        post_error.assert_not_called()
     
     def test_posting_worker_content_error(self):
         """Test the posting worker with content generation error."""
         # Set up content generator to return error
-        self.content_generator.generate_content.return_value = {
-            "success": False,
-            "error": "API error",
-            "category": "Bitcoin",
-            "topic": "Bitcoin basics"
-        }
+        self.content_generator.generate_content.return_value = _CONTENT_ERROR
         
         # Set up fallback method
-        self.content_generator.generate_content_without_api.return_value = {
-            "success": True,
-            "text": "Fallback tweet about Bitcoin",
-            "hashtags": ["#Bitcoin", "#Crypto", "#BTC"],
-            "category": "Bitcoin",
-            "topic": "Bitcoin basics",
-            "full_text_with_hashtags": "Fallback tweet about Bitcoin\n\n#Bitcoin #Crypto #BTC"
-        }
+        self.content_generator.generate_content_without_api.return_value = _FALLBACK_CONTENT
         
         # Create posting worker
         worker = PostingWorker(
@@ -119,10 +153,8 @@ class TestIntegration(unittest.TestCase):
             self.image_generator
         )
         
-        # Mock signals
-        worker.status_update = MagicMock()
-        worker.post_complete = MagicMock()
-        worker.post_error = MagicMock()
+        # Connect mock slots
+        status_update, post_complete, post_error = self._connect_mock_slots(worker)
         
         # Run the worker
         worker.run()
@@ -137,9 +169,9 @@ class TestIntegration(unittest.TestCase):
         self.twitter_api.post_tweet.assert_called_once()
         
         # Verify signals
-        worker.status_update.assert_called()
-        worker.post_complete.assert_called_once()
-        worker.post_error.assert_not_called()
+        status_update.assert_called()
+        post_complete.assert_called_once()
+        post_error.assert_not_called()
     
     def test_posting_worker_image_error(self):
         """Test the posting worker with image generation error."""
@@ -153,10 +185,8 @@ class TestIntegration(unittest.TestCase):
             self.image_generator
         )
         
-        # Mock signals
-        worker.status_update = MagicMock()
-        worker.post_complete = MagicMock()
-        worker.post_error = MagicMock()
+        # Connect mock slots
+        status_update, post_complete, post_error = self._connect_mock_slots(worker)
         
         # Run the worker
         worker.run()
@@ -167,9 +197,9 @@ class TestIntegration(unittest.TestCase):
         self.twitter_api.post_tweet.assert_not_called()
         
         # Verify signals
-        worker.status_update.assert_called()
-        worker.post_complete.assert_not_called()
-        worker.post_error.assert_called_once()
+        status_update.assert_called()
+        post_complete.assert_not_called()
+        post_error.assert_called_once()
     
     def test_posting_worker_twitter_error(self):
         """Test the posting worker with Twitter API error."""
@@ -183,10 +213,8 @@ class TestIntegration(unittest.TestCase):
             self.image_generator
         )
         
-        # Mock signals
-        worker.status_update = MagicMock()
-        worker.post_complete = MagicMock()
-        worker.post_error = MagicMock()
+        # Connect mock slots
+        status_update, post_complete, post_error = self._connect_mock_slots(worker)
         
         # Run the worker
         worker.run()
@@ -197,41 +225,88 @@ class TestIntegration(unittest.TestCase):
         self.twitter_api.post_tweet.assert_called_once()
         
         # Verify signals
-        worker.status_update.assert_called()
-        worker.post_complete.assert_not_called()
-        worker.post_error.assert_called_once()
+        status_update.assert_called()
+        post_complete.assert_not_called()
+        post_error.assert_called_once()
     
-    @patch('PyQt5.QtCore.QThread.msleep')
-    def test_schedule_worker(self, mock_sleep):
+    def test_schedule_worker(self):
         """Test the schedule worker."""
-        # Create schedule worker with short interval for testing
-        worker = ScheduleWorker(interval_hours=0.001)  # Almost immediate
-        
-        # Mock signals
-        worker.schedule_update = MagicMock()
-        worker.trigger_post = MagicMock()
-        
-        # Set up to run briefly then stop
-        def stop_after_trigger(*args, **kwargs):
-            worker.running = False
-        
-        worker.trigger_post.connect(stop_after_trigger)
-        
-        # Run the worker
-        worker.run()
-        
-        # Verify signals
-        worker.schedule_update.assert_called()
-        worker.trigger_post.assert_called_once()
+        # Timers need an application instance; a QApplication so the GUI
+        # tests can share it
+        app = QApplication.instance() or QApplication([])
+        
+        # Create schedule worker
+        worker = ScheduleWorker(interval_hours=1)
+        
+        # Connect mock slots
+        schedule_update = MagicMock()
+        trigger_post = MagicMock()
+        worker.schedule_update.connect(schedule_update)
+        worker.trigger_post.connect(trigger_post)
+        
+        worker.start()
+        try:
+            # Verify the countdown was shown and the post timer armed
+            schedule_update.assert_called()
+            self.assertTrue(schedule_update.call_args[0][0].startswith("Next post in: 0"))
+            self.assertTrue(worker._post_timer.isActive())
+            
+            # Fire the post timer as if the interval elapsed
+            first_post_time = worker.next_post_monotonic
+            worker._post_timer.timeout.emit()
+            
+            # Verify signals and that the next post was scheduled
+            trigger_post.assert_called_once()
+            self.assertGreaterEqual(worker.next_post_monotonic, first_post_time)
+        finally:
+            worker.stop()
+        
+        self.assertFalse(worker._tick_timer.isActive())
+        self.assertFalse(worker._post_timer.isActive())
+    
+    def test_gui_defers_backends(self):
+        """Test that loading saved credentials leaves the components uncreated."""
+        # Widgets need an application instance
+        app = QApplication.instance() or QApplication([])
+        
+        credentials = {
+            'twitter_api_key': 'key',
+            'twitter_api_secret': 'secret',
+            'twitter_access_token': 'token',
+            'twitter_access_token_secret': 'token_secret',
+            'openai_api_key': 'openai_key'
+        }
+        settings_file = os.path.join(self.data_dir, "settings.ini")
+        
+        # Load the credentials from a mocked keyring, keeping settings in the
+        # temporary directory
+        with patch('gui.QSettings', side_effect=lambda *args: QSettings(settings_file, QSettings.IniFormat)), \
+             patch.object(AIInfluencerGUI, '_load_keyring_credentials', return_value=credentials):
+            window = AIInfluencerGUI()
+        
+        try:
+            # Verify the credentials were loaded into the inputs only
+            self.assertEqual(window.api_key_input.text(), 'key')
+            self.assertEqual(window.openai_api_key_input.text(), 'openai_key')
+            self.assertIsNone(window.twitter_api)
+            self.assertIsNone(window.content_generator)
+            self.assertIsNone(window.image_generator)
+            self.assertIsNone(window.posting_worker)
+        finally:
+            window.schedule_worker.stop()
+            window.deleteLater()
     
     def test_content_image_integration(self):
         """Test integration between content and image generation."""
-        # Create real instances for this test
+        # Create real instances for this test, without reaching out for fonts;
+        # the image is then drawn with Pillow's default font
         content_gen = ContentGenerator()
-        image_gen = ImageGenerator()
+        with patch.object(ImageGenerator, '_download', side_effect=OSError("offline")):
+            image_gen = ImageGenerator()
         
-        # Generate content without API
-        content = content_gen.generate_content_without_api()
+        # Generate content without API; Bitcoin images are drawn without
+        # matplotlib, which keeps this end-to-end test fast
+        content = content_gen.generate_content_without_api(category="Bitcoin")
         
         # Verify content
         self.assertTrue(content["success"])
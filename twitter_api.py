@@ -15,26 +15,75 @@ This module handles all interactions with the Twitter API, including:
 import os
 import json
 import logging
-from typing import Dict, List, Optional, Tuple, Union
-import tweepy
-from dotenv import load_dotenv
+import functools
+import operator
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if TYPE_CHECKING:
+    import tweepy
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("twitter_api.log"),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger("TwitterAPI")
 
+
+def _tweepy():
+    """
+    Import tweepy on first use; it pulls in requests and oauthlib, which only
+    authenticated calls need.
+    
+    Returns:
+        module: tweepy
+    """
+    import tweepy
+    return tweepy
+
+# User info keys, and the attributes of a Tweepy user they are read from
+_USER_INFO_KEYS = ('id', 'screen_name', 'name', 'description', 'followers_count',
+                   'friends_count', 'statuses_count', 'profile_image_url')
+_get_user_info = operator.attrgetter('id', 'screen_name', 'name', 'description', 'followers_count',
+                                     'friends_count', 'statuses_count', 'profile_image_url_https')
+
+# Tweet fields shared by the timeline and search results, and the search result author
+_get_tweet_fields = operator.attrgetter('id', 'text', 'created_at', 'retweet_count', 'favorite_count')
+_get_tweet_user = operator.attrgetter('user.id', 'user.screen_name', 'user.name')
+
+
+def _require_auth(action: str, default=None):
+    """
+    Make a TwitterAPI method authenticate first, if it has not already.
+    
+    Args:
+        action: What the method does, for the error message
+        default: Value returned when authentication fails
+        
+    Returns:
+        callable: Method decorator
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not self.authenticated and not self.authenticate():
+                logger.error(f"Cannot {action}: Not authenticated")
+                return default
+            return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
 class TwitterAPI:
     """
     Class to handle all Twitter API interactions for the AI Influencer system.
     """
     
+    # Verified (API, Client) pairs shared by instances, keyed by the four credentials.
+    # A cached pair is not verified again; it is dropped as soon as Twitter
+    # rejects it as unauthorized (see _forget_clients)
+    _clients: Dict[Tuple[str, str, str, str], Tuple["tweepy.API", "tweepy.Client"]] = {}
+    
     def __init__(self, credentials_file: Optional[str] = None):
         """
         Initialize the Twitter API client.
@@ -45,6 +94,8 @@ class TwitterAPI:
         self.api = None
         self.client = None
         self.authenticated = False
+        # Whether all four credentials are set; updated by the credential loaders
+        self._has_credentials = False
         
         # Try to load credentials from file or environment variables
         if credentials_file and os.path.exists(credentials_file):
@@ -60,13 +111,15 @@ class TwitterAPI:
             credentials_file: Path to the credentials JSON file
         """
         try:
-            with open(credentials_file, 'r') as f:
-                credentials = json.load(f)
-                
+            with open(credentials_file, 'rb') as f:
+                data = f.read()
+            credentials = orjson.loads(data) if orjson else json.loads(data)
+            
             self.api_key = credentials.get('api_key')
             self.api_secret = credentials.get('api_secret')
             self.access_token = credentials.get('access_token')
             self.access_token_secret = credentials.get('access_token_secret')
+            self._update_has_credentials()
             
             logger.info("Credentials loaded from file")
         except Exception as e:
@@ -78,18 +131,40 @@ class TwitterAPI:
         Load API credentials from environment variables.
         """
         # Load .env file if it exists
+        from dotenv import load_dotenv
         load_dotenv()
         
         self.api_key = os.getenv('TWITTER_API_KEY')
         self.api_secret = os.getenv('TWITTER_API_SECRET')
         self.access_token = os.getenv('TWITTER_ACCESS_TOKEN')
         self.access_token_secret = os.getenv('TWITTER_ACCESS_TOKEN_SECRET')
+        self._update_has_credentials()
         
-        if all([self.api_key, self.api_secret, self.access_token, self.access_token_secret]):
+        if self._has_credentials:
             logger.info("Credentials loaded from environment variables")
         else:
             logger.warning("Some credentials are missing from environment variables")
     
+    def _update_has_credentials(self) -> None:
+        """Record whether all four credentials are set, so authenticate need not recheck them."""
+        self._has_credentials = all((self.api_key, self.api_secret, self.access_token, self.access_token_secret))
+    
+    def _credentials_key(self) -> Tuple[str, str, str, str]:
+        """Get the key the verified clients for the current credentials are cached under."""
+        return (self.api_key, self.api_secret, self.access_token, self.access_token_secret)
+    
+    def _forget_clients(self, error: Exception) -> None:
+        """
+        Drop the cached clients once Twitter rejects the credentials, so the
+        next call authenticates and verifies them again.
+        
+        Args:
+            error: Error raised by a Tweepy call
+        """
+        if isinstance(error, _tweepy().Unauthorized):
+            TwitterAPI._clients.pop(self._credentials_key(), None)
+            self.authenticated = False
+    
     def authenticate(self) -> bool:
         """
         Authenticate with the Twitter API using the loaded credentials.
@@ -97,12 +172,21 @@ class TwitterAPI:
         Returns:
             bool: True if authentication was successful, False otherwise
         """
+        tweepy = _tweepy()
         try:
             # Check if credentials are available
-            if not all([self.api_key, self.api_secret, self.access_token, self.access_token_secret]):
+            if not self._has_credentials:
                 logger.error("Missing credentials for Twitter API authentication")
                 return False
             
+            # Reuse the clients already verified for these credentials
+            credentials = self._credentials_key()
+            clients = TwitterAPI._clients.get(credentials)
+            if clients is not None:
+                self.api, self.client = clients
+                self.authenticated = True
+                return True
+            
             # Set up authentication with tweepy
             auth = tweepy.OAuth1UserHandler(
                 self.api_key, 
@@ -122,6 +206,7 @@ class TwitterAPI:
             
             # Verify credentials
             self.api.verify_credentials()
+            TwitterAPI._clients[credentials] = (self.api, self.client)
             self.authenticated = True
             logger.info("Successfully authenticated with Twitter API")
             return True
@@ -146,6 +231,7 @@ class TwitterAPI:
         self.api_secret = api_secret
         self.access_token = access_token
         self.access_token_secret = access_token_secret
+        self._update_has_credentials()
         
         logger.info("Credentials set manually")
     
@@ -170,8 +256,9 @@ class TwitterAPI:
             # Create directory if it doesn't exist
             os.makedirs(os.path.dirname(credentials_file), exist_ok=True)
             
-            with open(credentials_file, 'w') as f:
-                json.dump(credentials, f)
+            data = orjson.dumps(credentials) if orjson else json.dumps(credentials).encode('utf-8')
+            with open(credentials_file, 'wb') as f:
+                f.write(data)
             
             logger.info(f"Credentials saved to {credentials_file}")
             return True
@@ -179,6 +266,7 @@ class TwitterAPI:
             logger.error(f"Error saving credentials: {str(e)}")
             return False
     
+    @_require_auth("post tweet")
     def post_tweet(self, text: str, image_path: Optional[str] = None) -> Optional[str]:
         """
         Post a tweet with optional image attachment.
@@ -190,16 +278,16 @@ class TwitterAPI:
         Returns:
             str: ID of the posted tweet if successful, None otherwise
         """
-        if not self.authenticated:
-            if not self.authenticate():
-                logger.error("Cannot post tweet: Not authenticated")
-                return None
-        
         try:
             # Handle image upload if provided
             media_ids = []
-            if image_path and os.path.exists(image_path):
-                media = self.api.media_upload(image_path)
+            if image_path:
+                # Let the upload report a missing file rather than checking first
+                try:
+                    media = self.api.media_upload(image_path)
+                except OSError as e:
+                    logger.error(f"Error reading image {image_path}: {str(e)}")
+                    return None
                 media_ids.append(media.media_id)
                 logger.info(f"Uploaded image: {image_path}")
             
@@ -213,10 +301,12 @@ class TwitterAPI:
             logger.info(f"Successfully posted tweet with ID: {tweet_id}")
             return tweet_id
             
-        except tweepy.TweepyException as e:
+        except _tweepy().TweepyException as e:
             logger.error(f"Error posting tweet: {str(e)}")
+            self._forget_clients(e)
             return None
     
+    @_require_auth("get user info")
     def get_user_info(self) -> Optional[Dict]:
         """
         Get information about the authenticated user.
@@ -224,29 +314,16 @@ class TwitterAPI:
         Returns:
             dict: User information if successful, None otherwise
         """
-        if not self.authenticated:
-            if not self.authenticate():
-                logger.error("Cannot get user info: Not authenticated")
-                return None
-        
         try:
             user = self.api.verify_credentials()
-            user_info = {
-                'id': user.id,
-                'screen_name': user.screen_name,
-                'name': user.name,
-                'description': user.description,
-                'followers_count': user.followers_count,
-                'friends_count': user.friends_count,
-                'statuses_count': user.statuses_count,
-                'profile_image_url': user.profile_image_url_https
-            }
-            return user_info
-            
-        except tweepy.TweepyException as e:
+            return dict(zip(_USER_INFO_KEYS, _get_user_info(user)))
+        
+        except _tweepy().TweepyException as e:
             logger.error(f"Error getting user info: {str(e)}")
+            self._forget_clients(e)
             return None
     
+    @_require_auth("get user tweets")
     def get_user_tweets(self, count: int = 10) -> Optional[List[Dict]]:
         """
         Get recent tweets from the authenticated user.
@@ -257,32 +334,28 @@ class TwitterAPI:
         Returns:
             list: List of tweet dictionaries if successful, None otherwise
         """
-        if not self.authenticated:
-            if not self.authenticate():
-                logger.error("Cannot get user tweets: Not authenticated")
-                return None
-        
         try:
             tweets = self.api.user_timeline(count=count)
             
-            tweet_list = []
-            for tweet in tweets:
-                tweet_data = {
-                    'id': tweet.id,
-                    'text': tweet.text,
-                    'created_at': tweet.created_at.isoformat(),
-                    'retweet_count': tweet.retweet_count,
-                    'favorite_count': tweet.favorite_count,
-                    'has_media': hasattr(tweet, 'entities') and 'media' in tweet.entities
+            return [
+                {
+                    'id': tweet_id,
+                    'text': text,
+                    'created_at': created_at.isoformat(),
+                    'retweet_count': retweet_count,
+                    'favorite_count': favorite_count,
+                    'has_media': 'media' in (getattr(tweet, 'entities', None) or ())
                 }
-                tweet_list.append(tweet_data)
-            
-            return tweet_list
-            
-        except tweepy.TweepyException as e:
+                for tweet, (tweet_id, text, created_at, retweet_count, favorite_count)
+                in zip(tweets, map(_get_tweet_fields, tweets))
+            ]
+        
+        except _tweepy().TweepyException as e:
             logger.error(f"Error getting user tweets: {str(e)}")
+            self._forget_clients(e)
             return None
     
+    @_require_auth("search tweets")
     def search_tweets(self, query: str, count: int = 20) -> Optional[List[Dict]]:
         """
         Search for tweets matching a query.
@@ -294,36 +367,32 @@ class TwitterAPI:
         Returns:
             list: List of tweet dictionaries if successful, None otherwise
         """
-        if not self.authenticated:
-            if not self.authenticate():
-                logger.error("Cannot search tweets: Not authenticated")
-                return None
-        
         try:
             tweets = self.api.search_tweets(q=query, count=count)
             
-            tweet_list = []
-            for tweet in tweets:
-                tweet_data = {
-                    'id': tweet.id,
-                    'text': tweet.text,
-                    'created_at': tweet.created_at.isoformat(),
+            return [
+                {
+                    'id': tweet_id,
+                    'text': text,
+                    'created_at': created_at.isoformat(),
                     'user': {
-                        'id': tweet.user.id,
-                        'screen_name': tweet.user.screen_name,
-                        'name': tweet.user.name
+                        'id': user_id,
+                        'screen_name': screen_name,
+                        'name': name
                     },
-                    'retweet_count': tweet.retweet_count,
-                    'favorite_count': tweet.favorite_count
+                    'retweet_count': retweet_count,
+                    'favorite_count': favorite_count
                 }
-                tweet_list.append(tweet_data)
-            
-            return tweet_list
-            
-        except tweepy.TweepyException as e:
+                for (tweet_id, text, created_at, retweet_count, favorite_count), (user_id, screen_name, name)
+                in zip(map(_get_tweet_fields, tweets), map(_get_tweet_user, tweets))
+            ]
+        
+        except _tweepy().TweepyException as e:
             logger.error(f"Error searching tweets: {str(e)}")
+            self._forget_clients(e)
             return None
     
+    @_require_auth("delete tweet", default=False)
     def delete_tweet(self, tweet_id: str) -> bool:
         """
         Delete a tweet by ID.
@@ -334,24 +403,30 @@ class TwitterAPI:
         Returns:
             bool: True if successful, False otherwise
         """
-        if not self.authenticated:
-            if not self.authenticate():
-                logger.error("Cannot delete tweet: Not authenticated")
-                return False
-        
         try:
             self.client.delete_tweet(id=tweet_id)
             logger.info(f"Successfully deleted tweet with ID: {tweet_id}")
             return True
             
-        except tweepy.TweepyException as e:
+        except _tweepy().TweepyException as e:
             logger.error(f"Error deleting tweet: {str(e)}")
+            self._forget_clients(e)
             return False
 
 
 # Example usage
 if __name__ == "__main__":
     # This code will only run if the file is executed directly
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler("twitter_api.log"),
+            logging.StreamHandler()
+        ]
+    )
+    
     twitter = TwitterAPI()
     
     # Example: Set credentials manually